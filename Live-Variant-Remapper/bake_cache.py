@@ -0,0 +1,193 @@
+"""
+bake_cache.py
+
+Persistent cache of baked variant textures, shared across sessions and batch
+runs. Each bake is stored under a hash of everything that determines its
+pixels (base image fingerprint, engine, remap pairs, tolerance and LUT), so
+re-baking an unchanged variant just loads the file.
+
+Entries are PNG files (OpenEXR for float images) in the cache directory. When
+the directory grows past the size cap, the least recently used entries are
+deleted; a hit refreshes the entry's modification time.
+
+Usage example:
+
+    import bake_cache as bc
+    key = bc.bake_key(src_img, remap_pairs, 0.1, 'BAKE')
+    img = bc.load_cached_bake(key, src_img, "Cube_Variant_RemapTex")
+    if img is None:
+        pending = bc.pending_path(key, src_img.is_float)
+        img = bake_remapped_image(src_img, remap_pairs, 0.1, name="Cube_Variant_RemapTex",
+                                  save_to=pending)
+        bc.commit_bake(pending, key, src_img.is_float)
+
+Writing to the cache is best-effort: I/O errors are logged and the bake
+itself still succeeds.
+"""
+
+import hashlib
+import os
+import uuid
+
+import bpy
+import numpy as np
+
+from remap_bake import image_fingerprint
+
+
+# Bump when the bake math changes, so old entries are never loaded
+CACHE_VERSION = 1
+
+# Set from the add-on preferences (see ui.py)
+cache_settings = {
+    "directory": "",  # "" = Blender's user data folder
+    "max_bytes": 2 * 2**30,  # 0 = cache disabled
+}
+
+CACHE_EXTENSIONS = (".png", ".exr")
+
+
+def configure(**settings):
+    """Update `cache_settings` (called from the add-on preferences)."""
+    cache_settings.update(settings)
+
+
+def cache_directory():
+    """Return the cache directory, creating it if needed."""
+    directory = cache_settings["directory"]
+    if directory:
+        directory = bpy.path.abspath(directory)
+        os.makedirs(directory, exist_ok=True)
+        return directory
+    return bpy.utils.user_resource('DATAFILES', path="live_variant_bakes", create=True)
+
+
+def bake_key(src_img, remap_pairs, tolerance, engine, lut=None):
+    """
+    Hash the inputs of a bake.
+
+    Args:
+        src_img (Image): Source texture found in the base material.
+        remap_pairs (list[tuple]): List of ((R,G,B,A), (R,G,B,A)) pairs.
+        tolerance (float): Color distance threshold.
+        engine (str): 'BAKE', 'LUT' or 'LABELS'.
+        lut (tuple): (table, domain_min, domain_max) for the 'LUT' engine.
+
+    Returns:
+        str: Hex digest, or None if caching is off or the image's content
+        cannot be fingerprinted (e.g. unsaved paint strokes).
+    """
+    if cache_settings["max_bytes"] <= 0:
+        return None
+    fingerprint = image_fingerprint(src_img)
+    if fingerprint is None:
+        return None
+
+    pairs = [tuple(tuple(round(float(c), 6) for c in color) for color in pair)
+             for pair in remap_pairs]
+    digest = hashlib.sha256(repr((
+        CACHE_VERSION, fingerprint, engine, round(float(tolerance), 6), pairs,
+    )).encode())
+    if lut is not None:
+        table, domain_min, domain_max = lut
+        digest.update(np.ascontiguousarray(table, dtype=np.float32).tobytes())
+        domain = [np.broadcast_to(domain_min, 3), np.broadcast_to(domain_max, 3)]
+        digest.update(np.asarray(domain, dtype=np.float32).tobytes())
+    return digest.hexdigest()
+
+
+def entry_path(key, is_float):
+    """File path of the cache entry for `key`."""
+    return os.path.join(cache_directory(), key + (".exr" if is_float else ".png"))
+
+
+def pending_path(key, is_float):
+    """
+    Unique path a new entry is written to before commit_bake() moves it in
+    place, so processes baking the same key never share a half-written file.
+
+    Returns:
+        str: The path, or None if the cache directory is not usable.
+    """
+    try:
+        path = entry_path(key, is_float)
+    except OSError as e:
+        print(f"⚠️ Bake cache unavailable: {e}")
+        return None
+    return f"{path}.{os.getpid()}-{uuid.uuid4().hex[:8]}.part"
+
+
+def load_cached_bake(key, like_image, name):
+    """
+    Load the cache entry for `key` as an image called `name`, replacing any
+    existing image of that name.
+
+    Returns:
+        Image: The cached bake, packed into the .blend file, or None on a miss.
+    """
+    try:
+        path = entry_path(key, like_image.is_float)
+        if not os.path.isfile(path):
+            return None
+        img = bpy.data.images.load(path, check_existing=False)
+        os.utime(path)  # mark as recently used
+    except (OSError, RuntimeError) as e:
+        print(f"⚠️ Could not load cached bake for '{name}': {e}")
+        return None
+
+    img.colorspace_settings.name = like_image.colorspace_settings.name
+    img.pack()
+    previous = bpy.data.images.get(name)
+    if previous and previous != img:
+        previous.user_remap(img)
+        bpy.data.images.remove(previous)
+    img.name = name
+
+    print(f"📦 Loaded cached bake into '{img.name}'")
+    return img
+
+
+def commit_bake(pending, key, is_float):
+    """
+    Move a bake written to `pending` (see pending_path) into the cache and
+    enforce the size cap. Does nothing if the bake was not written.
+    """
+    if not pending or not os.path.isfile(pending):
+        return
+    try:
+        os.replace(pending, entry_path(key, is_float))
+        evict()
+    except OSError as e:
+        print(f"⚠️ Could not store bake in the cache: {e}")
+        try:
+            os.remove(pending)
+        except OSError:
+            pass
+
+
+def evict(max_bytes=None):
+    """Delete least recently used entries until the cache fits in `max_bytes`."""
+    if max_bytes is None:
+        max_bytes = cache_settings["max_bytes"]
+    directory = cache_directory()
+
+    entries = []
+    for entry in os.scandir(directory):
+        if entry.is_file() and entry.name.endswith(CACHE_EXTENSIONS):
+            stat = entry.stat()
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        try:
+            os.remove(path)
+        except OSError:
+            continue
+        total -= size
+
+
+def clear_cache():
+    """Delete every cache entry."""
+    evict(max_bytes=0)
@@ -0,0 +1,369 @@
+"""
+batch_runner.py
+
+Headless batch generation of color variants from a manifest, for render
+nodes and pipelines. Runs inside Blender without a UI context and without
+bpy.ops (except for saving and reopening the optional output file):
+
+    blender -b assets.blend --python batch_runner.py -- \\
+        --manifest colorways.jsonl --output assets_variants.blend
+
+or, with this folder on sys.path:
+
+    blender -b assets.blend --python-expr \\
+        "import sys, batch_runner; sys.exit(batch_runner.main())" -- --manifest colorways.json
+
+The manifest is a JSON list of jobs (or {"jobs": [...]}), or JSONL with one
+job per line. Only "base" and "remaps" are required:
+
+    {"base": "Cube", "name": "Cube_Blue", "tolerance": 0.08, "engine": "BAKE",
+     "share_mesh": true, "remaps": [[[1.0, 0.8, 0.0, 1.0], [0.0, 0.2, 1.0, 1.0]]]}
+
+Bases stay in place; each variant goes into its base's "<base>_Variants"
+collection at the next slot of a grid (--spacing, --columns).
+
+JSONL manifests are streamed one line at a time, so memory does not grow
+with the manifest. Each job's result (with its timing) is appended to a
+results log as it finishes, and a JSON summary is written at the end.
+
+Checkpoint / resume (needs `--output`): the hash of every successful job
+is appended to a checkpoint file once the .blend holding its result has
+been saved, after every `--save-every` jobs. Rerunning the same command
+skips checkpointed jobs and continues in the saved output file, so a crash
+only costs the jobs since the last save. Without `--output` nothing is
+persisted, so nothing is checkpointed and every run does every job.
+
+Exit codes: 0 = every job succeeded, 1 = some jobs failed,
+2 = the manifest could not be read, 3 = the run stopped because the output,
+results log or checkpoint could not be written.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+
+# Blender does not put a --python script's folder on sys.path
+_SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+if _SCRIPT_DIR not in sys.path:
+    sys.path.insert(0, _SCRIPT_DIR)
+
+import bpy
+
+from texture_setup import duplicate_with_rig_and_texture
+from variant_layout import DEFAULT_COLUMNS, variant_collection, place_variant
+from multi_remap_controller import apply_multi_remap
+
+
+EXIT_OK = 0
+EXIT_JOBS_FAILED = 1
+EXIT_BAD_MANIFEST = 2
+EXIT_RUN_FAILED = 3
+
+
+class ManifestError(Exception):
+    """The manifest could not be read."""
+
+
+class SaveError(Exception):
+    """The output .blend could not be saved."""
+
+
+# -----------------------------------------------------
+# MANIFEST
+# -----------------------------------------------------
+
+def iter_manifest(filepath):
+    """
+    Yield the manifest's jobs as JSON text, one at a time.
+
+    JSONL files are read lazily line by line; a malformed line only fails
+    its own job (see run_job). JSON files are loaded whole.
+
+    Raises:
+        ManifestError: The file cannot be read or is not a job list.
+    """
+    try:
+        if filepath.endswith(".jsonl"):
+            with open(filepath, "r", encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        yield line.strip()
+            return
+
+        with open(filepath, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        jobs = data["jobs"] if isinstance(data, dict) else data
+        texts = [json.dumps(job, sort_keys=True) for job in jobs]
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        raise ManifestError(e) from e
+    yield from texts
+
+
+def job_hash(job_text):
+    """Stable identity of a job, as recorded in the checkpoint file."""
+    return hashlib.sha1(job_text.encode("utf-8")).hexdigest()
+
+
+class Checkpoint:
+    """
+    Append-only file of completed job hashes.
+
+    Attributes:
+        done (set): Hashes of jobs completed by this or earlier runs.
+    """
+
+    def __init__(self, filepath):
+        self.filepath = filepath
+        self.done = set()
+        if os.path.isfile(filepath):
+            with open(filepath, "r", encoding="utf-8") as f:
+                self.done.update(line.strip() for line in f if line.strip())
+
+    def record(self, hashes):
+        """Durably append `hashes` to the checkpoint file."""
+        if not hashes:
+            return
+        with open(self.filepath, "a", encoding="utf-8") as f:
+            f.write("".join(f"{h}\n" for h in hashes))
+            f.flush()
+            os.fsync(f.fileno())
+        self.done.update(hashes)
+
+    def reset(self):
+        """Forget every completed job."""
+        if os.path.isfile(self.filepath):
+            os.remove(self.filepath)
+        self.done.clear()
+
+
+# -----------------------------------------------------
+# JOBS
+# -----------------------------------------------------
+
+def run_job(index, job_text, defaults):
+    """
+    Duplicate the job's base object and remap the duplicate.
+
+    Args:
+        index (int): Position of the job in the manifest.
+        job_text (str): Manifest entry, as JSON.
+        defaults (dict): tolerance / engine / lut_size / share_mesh used when the job
+            does not set them, plus the grid spacing / columns variants
+            are placed on (see variant_layout.py).
+
+    Returns:
+        dict: Result with index, base, variant, status ("ok" / "failed"),
+        error and seconds. A failed job's half-built variant is removed, so
+        it neither takes a grid slot nor ends up in the saved output.
+    """
+    started = time.perf_counter()
+    result = {"index": index, "base": None, "variant": None,
+              "status": "failed", "error": None}
+    base_obj = variant_obj = None
+    try:
+        job = json.loads(job_text)
+        result["base"] = job["base"]
+        base_obj = bpy.data.objects.get(job["base"])
+        if base_obj is None:
+            raise ValueError(f"base object '{job['base']}' not found")
+        if base_obj.type != 'MESH':
+            raise ValueError(f"'{job['base']}' is not a mesh object")
+        remaps = [(tuple(src), tuple(tgt)) for src, tgt in job["remaps"]]
+
+        # The base stays put; each variant takes the next slot of its grid
+        variant_obj = duplicate_with_rig_and_texture(
+            base_obj, variant_collection(base_obj),
+            share_mesh=job.get("share_mesh", defaults["share_mesh"]), offset=False)
+        if job.get("name"):
+            variant_obj.name = job["name"]
+        place_variant(base_obj, variant_obj, defaults["spacing"], defaults["columns"])
+        result["variant"] = variant_obj.name
+
+        remap_mat = apply_multi_remap(
+            base_obj, variant_obj, remaps,
+            tolerance=job.get("tolerance", defaults["tolerance"]),
+            engine=job.get("engine", defaults["engine"]),
+            lut_size=job.get("lut_size", defaults["lut_size"]),
+        )
+        if remap_mat is None:
+            raise RuntimeError("remap failed, see log above")
+        result["status"] = "ok"
+    except Exception as e:
+        result["error"] = f"{type(e).__name__}: {e}"
+        print(f"❌ Job {index} ({result['base']}) failed: {result['error']}")
+        if variant_obj is not None:
+            _discard_variant(base_obj, variant_obj)
+
+    result["seconds"] = round(time.perf_counter() - started, 4)
+    return result
+
+
+def _discard_variant(base_obj, variant_obj):
+    """Delete a failed job's variant, and its mesh unless it shares the base's."""
+    mesh = variant_obj.data
+    bpy.data.objects.remove(variant_obj, do_unlink=True)
+    if mesh is not None and mesh != base_obj.data and mesh.users == 0:
+        bpy.data.meshes.remove(mesh)
+
+
+def run_jobs(job_texts, defaults, checkpoint, results_log, save=None, save_every=1):
+    """
+    Run jobs as they are streamed in, skipping checkpointed ones.
+
+    Args:
+        job_texts (iterable[str]): Jobs as JSON text (see iter_manifest).
+        defaults (dict): See run_job().
+        checkpoint (Checkpoint): Completed jobs; successful jobs are added
+            once their results are saved. None to run every job without
+            checkpointing.
+        results_log (file): Text file each result is appended to as JSONL.
+        save (callable): Saves the .blend; None if results are not saved
+            (then nothing is checkpointed).
+        save_every (int): Successful jobs between saves.
+
+    Returns:
+        dict: Counts of jobs run, succeeded, failed and skipped.
+    """
+    totals = {"jobs": 0, "succeeded": 0, "failed": 0, "skipped": 0}
+    unsaved = []
+
+    for index, job_text in enumerate(job_texts):
+        digest = job_hash(job_text)
+        if checkpoint is not None and digest in checkpoint.done:
+            totals["skipped"] += 1
+            continue
+
+        result = run_job(index, job_text, defaults)
+        result["hash"] = digest
+        results_log.write(json.dumps(result) + "\n")
+        results_log.flush()
+
+        totals["jobs"] += 1
+        if result["status"] != "ok":
+            totals["failed"] += 1
+            continue
+        totals["succeeded"] += 1
+        if save is None:
+            continue
+        unsaved.append(digest)
+
+        if len(unsaved) >= save_every:
+            save()
+            if checkpoint is not None:
+                checkpoint.record(unsaved)
+            unsaved.clear()
+
+    if unsaved:
+        save()
+        if checkpoint is not None:
+            checkpoint.record(unsaved)
+    return totals
+
+
+def write_report(filepath, manifest, totals, seconds):
+    """Write the run's totals as JSON (per-job results are in the results log)."""
+    report = dict(totals, manifest=manifest, blend=bpy.data.filepath,
+                  seconds=round(seconds, 4))
+    with open(filepath, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    return report
+
+
+# -----------------------------------------------------
+# MAIN ENTRY
+# -----------------------------------------------------
+
+def parse_args(argv=None):
+    """Parse the arguments after Blender's `--` separator."""
+    if argv is None:
+        argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []
+
+    parser = argparse.ArgumentParser(
+        prog="batch_runner.py",
+        description="Generate color variants from a JSON/JSONL manifest.",
+    )
+    parser.add_argument("--manifest", required=True, help="JSON or JSONL job list")
+    parser.add_argument("--report", help="JSON summary (default: <manifest>.report.json)")
+    parser.add_argument("--results", help="Per-job JSONL log (default: <manifest>.results.jsonl)")
+    parser.add_argument("--checkpoint",
+                        help="Completed-job hashes, used with --output (default: <manifest>.checkpoint)")
+    parser.add_argument("--restart", action="store_true",
+                        help="Ignore the checkpoint and run every job again")
+    parser.add_argument("--output", help="Save the .blend here as jobs complete")
+    parser.add_argument("--save-every", type=int, default=1,
+                        help="Successful jobs between saves of --output")
+    parser.add_argument("--engine", default='BAKE',
+                        choices=('NODES', 'BAKE', 'LUT', 'LABELS', 'PALETTE', 'SHARED'),
+                        help="Engine for jobs that do not set one")
+    parser.add_argument("--tolerance", type=float, default=0.08,
+                        help="Tolerance for jobs that do not set one")
+    parser.add_argument("--lut-size", type=int, default=33,
+                        help="LUT size for jobs that do not set one")
+    parser.add_argument("--share-mesh", action="store_true",
+                        help="Variants share their base's mesh unless the job sets share_mesh")
+    parser.add_argument("--spacing", type=float,
+                        help="Distance between variants in each base's grid (default: from its size)")
+    parser.add_argument("--columns", type=int, default=DEFAULT_COLUMNS,
+                        help="Variants per grid row")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """
+    Run a manifest and return the process exit code.
+    """
+    args = parse_args(argv)
+    defaults = {"engine": args.engine, "tolerance": args.tolerance, "lut_size": args.lut_size,
+                "share_mesh": args.share_mesh, "spacing": args.spacing, "columns": args.columns}
+    if not os.path.isfile(args.manifest):
+        print(f"❌ Manifest '{args.manifest}' not found.")
+        return EXIT_BAD_MANIFEST
+
+    # Only saved results can be checkpointed, so resuming needs --output
+    checkpoint = save = None
+    if args.output:
+        checkpoint = Checkpoint(args.checkpoint or f"{args.manifest}.checkpoint")
+        if args.restart:
+            checkpoint.reset()
+        output = os.path.abspath(args.output)
+
+        def save():
+            try:
+                bpy.ops.wm.save_as_mainfile(filepath=output)
+            except (OSError, RuntimeError) as e:
+                raise SaveError(e) from e
+
+        # Checkpointed results live in the saved output, so continue there
+        if checkpoint.done and os.path.isfile(output) and bpy.data.filepath != output:
+            print(f"⏩ Resuming in '{output}' ({len(checkpoint.done)} jobs already done)")
+            bpy.ops.wm.open_mainfile(filepath=output, load_ui=False)
+
+    started = time.perf_counter()
+    try:
+        with open(args.results or f"{args.manifest}.results.jsonl", "a",
+                  encoding="utf-8") as results_log:
+            totals = run_jobs(iter_manifest(args.manifest), defaults, checkpoint,
+                              results_log, save, max(args.save_every, 1))
+    except ManifestError as e:
+        print(f"❌ Could not read manifest '{args.manifest}': {e}")
+        return EXIT_BAD_MANIFEST
+    except SaveError as e:
+        print(f"❌ Could not save '{output}', stopping (unsaved jobs are not checkpointed): {e}")
+        return EXIT_RUN_FAILED
+    except OSError as e:
+        print(f"❌ Could not write the results log or checkpoint, stopping: {e}")
+        return EXIT_RUN_FAILED
+    seconds = time.perf_counter() - started
+
+    report = write_report(args.report or f"{args.manifest}.report.json",
+                          args.manifest, totals, seconds)
+    print(f"📋 {report['succeeded']}/{report['jobs']} jobs succeeded, "
+          f"{report['skipped']} already done, in {seconds:.2f}s")
+    return EXIT_OK if report["failed"] == 0 else EXIT_JOBS_FAILED
+
+
+if __name__ == "__main__":
+    sys.exit(main())
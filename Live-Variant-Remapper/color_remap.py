@@ -2,7 +2,8 @@
 color_remap.py
 
 Utility to remap a specific color (or multiple colors) in a material’s texture
-to a new target color using Blender shader nodes.
+to a new target color, either live with Blender shader nodes or by baking the
+remapped colors into a new texture (see remap_bake.py).
 
 Usage example:
 
@@ -14,23 +15,179 @@ Usage example:
             ((1.0, 0.8, 0.0, 1.0), (0.0, 0.2, 1.0, 1.0)),  # Yellow → Blue
             ((0.8, 0.2, 0.2, 1.0), (0.1, 0.9, 0.3, 1.0)),  # Red → Green
         ],
-        tolerance=0.1
+        tolerance=0.1,
+        engine='NODES',  # or 'BAKE' / 'LUT' / 'LABELS' / 'PALETTE' / 'SHARED'
     )
 """
 
+import time
+
 import bpy
 
+from remap_bake import (
+    BakeJob, bake_remapped_image, bake_variant_batch, ensure_label_image, label_image_matches,
+    write_palette_image, last_bake_stats,
+)
+from remap_lut import build_lut
+from bake_cache import bake_key, load_cached_bake, pending_path, commit_bake
+from texture_setup import ensure_base_texture, variant_materials, assign_variant_materials
+
+
+# Shared node group holding the math for a single remap stage
+REMAP_STAGE_GROUP = "LV Remap Stage"
+REMAP_STAGE_VERSION = 2
+
+# Engine sharing one remap material per base across all its variants; each
+# variant holds its colors in custom properties read by Attribute nodes
+SHARED_SOURCE = "lv_source_{}"
+SHARED_TARGET = "lv_target_{}"
+SHARED_STRENGTH = "lv_strength_{}"
+SHARED_TOLERANCE = "lv_remap_tolerance"
+
+
+def get_remap_stage_group():
+    """
+    Return the shared "LV Remap Stage" shader node group, building it on
+    first use. Every remap material instances this one datablock per pair
+    instead of carrying its own copy of the stage nodes.
 
-def apply_color_remaps(base_obj, variant_obj, remap_pairs, tolerance=0.1):
+    Inputs:  Color, Source, Target, Tolerance, Strength
+    Outputs: Color = mix(Color, Target,
+                         clamp(1 - |Color - Source| / Tolerance) * Strength)
+    """
+    group = bpy.data.node_groups.get(REMAP_STAGE_GROUP)
+    if group and group.bl_idname == "ShaderNodeTree" \
+            and group.get("lv_version") == REMAP_STAGE_VERSION:
+        return group
+
+    if not group or group.bl_idname != "ShaderNodeTree":
+        group = bpy.data.node_groups.new(REMAP_STAGE_GROUP, "ShaderNodeTree")
+    _build_remap_stage_group(group)
+    group["lv_version"] = REMAP_STAGE_VERSION
+    return group
+
+
+def _build_remap_stage_group(group):
+    """(Re)build the internals of the remap stage node group in place."""
+    group.nodes.clear()
+
+    # Keep existing sockets so links in materials using the group survive
+    iface = group.interface
+    existing = {
+        (item.in_out, item.name) for item in iface.items_tree
+        if item.item_type == 'SOCKET'
+    }
+
+    def ensure_socket(name, in_out, socket_type):
+        if (in_out, name) in existing:
+            return None
+        return iface.new_socket(name, in_out=in_out, socket_type=socket_type)
+
+    ensure_socket("Color", 'INPUT', 'NodeSocketColor')
+    ensure_socket("Source", 'INPUT', 'NodeSocketColor')
+    ensure_socket("Target", 'INPUT', 'NodeSocketColor')
+    tol = ensure_socket("Tolerance", 'INPUT', 'NodeSocketFloat')
+    if tol:
+        tol.default_value = 0.1
+        tol.min_value = 0.0
+    strength = ensure_socket("Strength", 'INPUT', 'NodeSocketFloat')
+    if strength:
+        strength.default_value = 1.0
+        strength.min_value = 0.0
+        strength.max_value = 1.0
+    ensure_socket("Color", 'OUTPUT', 'NodeSocketColor')
+
+    nodes = group.nodes
+    links = group.links
+
+    g_in = nodes.new("NodeGroupInput")
+    g_out = nodes.new("NodeGroupOutput")
+    dist = nodes.new("ShaderNodeVectorMath")
+    safe_tol = nodes.new("ShaderNodeMath")
+    div = nodes.new("ShaderNodeMath")
+    sub = nodes.new("ShaderNodeMath")
+    clamp = nodes.new("ShaderNodeClamp")
+    scale = nodes.new("ShaderNodeMath")
+    mix = nodes.new("ShaderNodeMixRGB")
+
+    g_in.location = (-600, 0)
+    dist.location = (-350, 100)
+    safe_tol.location = (-350, -100)
+    div.location = (-100, 50)
+    sub.location = (150, 50)
+    clamp.location = (400, 50)
+    scale.location = (600, 50)
+    mix.location = (800, 0)
+    g_out.location = (1000, 0)
+
+    dist.operation = 'DISTANCE'
+    safe_tol.operation = 'MAXIMUM'
+    div.operation = 'DIVIDE'
+    sub.operation = 'SUBTRACT'
+    scale.operation = 'MULTIPLY'
+    safe_tol.inputs[1].default_value = 1e-5
+    sub.inputs[0].default_value = 1.0
+
+    # fac = clamp(1 - distance(color, source) / max(tolerance, 1e-5))
+    links.new(g_in.outputs["Color"], dist.inputs[0])
+    links.new(g_in.outputs["Source"], dist.inputs[1])
+    links.new(g_in.outputs["Tolerance"], safe_tol.inputs[0])
+    links.new(dist.outputs["Value"], div.inputs[0])
+    links.new(safe_tol.outputs["Value"], div.inputs[1])
+    links.new(div.outputs["Value"], sub.inputs[1])
+    links.new(sub.outputs["Value"], clamp.inputs["Value"])
+    links.new(clamp.outputs["Result"], scale.inputs[0])
+    links.new(g_in.outputs["Strength"], scale.inputs[1])
+
+    # color = mix(color, target, fac * strength)
+    links.new(g_in.outputs["Color"], mix.inputs[1])
+    links.new(g_in.outputs["Target"], mix.inputs[2])
+    links.new(scale.outputs["Value"], mix.inputs["Fac"])
+    links.new(mix.outputs["Color"], g_out.inputs["Color"])
+
+
+def find_source_image(mat):
+    """Return the first image used by an Image Texture node in `mat`, or None."""
+    if not mat or not mat.use_nodes:
+        return None
+    for n in mat.node_tree.nodes:
+        if n.type == "TEX_IMAGE" and n.image:
+            return n.image
+    return None
+
+
+def base_source_image(base_obj):
+    """
+    Return the texture of `base_obj`'s active material, allocating a pending
+    lazy base texture first if needed (see texture_setup.py).
+    """
+    return find_source_image(base_obj.active_material) or ensure_base_texture(base_obj)
+
+
+def apply_color_remaps(base_obj, variant_obj, remap_pairs, tolerance=0.1, engine='NODES',
+                       lut=None, lut_size=33):
     """
     Create or update the variant's material to replace multiple source colors
-    with target colors using node-based remapping.
+    with target colors.
 
     Args:
         base_obj (Object): The base mesh object containing the source material.
         variant_obj (Object): The variant mesh object to apply the remapped material.
         remap_pairs (list[tuple]): List of ((R,G,B,A), (R,G,B,A)) pairs to replace.
         tolerance (float): Color distance threshold for blending (0.01–0.5).
+        engine (str): 'NODES' builds a live remap node chain, 'BAKE' bakes
+            the remapped colors into a new image (texture → BSDF only),
+            'LUT' bakes through a compiled 3D lookup table, 'LABELS' bakes
+            through a cached per-texel label map (fast target-only edits),
+            'PALETTE' samples that label map plus a small palette image in
+            a fixed-size shader, so target edits only rewrite the palette.
+            'SHARED' gives all variants of the base one node material and
+            stores each variant's colors in its own custom properties, so
+            new variants need no new shader.
+        lut (tuple): Optional (table, domain_min, domain_max) for the 'LUT'
+            engine, e.g. from remap_lut.read_cube(). Compiled from
+            `remap_pairs` when omitted.
+        lut_size (int): Table resolution used when compiling the LUT.
 
     Returns:
         Material: The remapped material assigned to the variant.
@@ -43,88 +200,646 @@ def apply_color_remaps(base_obj, variant_obj, remap_pairs, tolerance=0.1):
         print("❌ Base object has no material to copy from.")
         return None
 
-    base_mat = base_obj.active_material
-    src_img = None
-    if base_mat.use_nodes:
-        for n in base_mat.node_tree.nodes:
-            if n.type == "TEX_IMAGE" and n.image:
-                src_img = n.image
-                break
+    src_img = base_source_image(base_obj)
+    if not src_img:
+        print("❌ No texture image found in base material.")
+        return None
+
+    if engine == 'BAKE':
+        return _apply_baked_remaps(src_img, variant_obj, remap_pairs, tolerance)
+    if engine == 'LUT':
+        if lut is None:
+            lut = (build_lut(remap_pairs, tolerance, lut_size), 0.0, 1.0)
+        return _apply_baked_remaps(src_img, variant_obj, remap_pairs, tolerance, lut)
+    if engine == 'LABELS':
+        return _apply_baked_remaps(src_img, variant_obj, remap_pairs, tolerance,
+                                   use_label_map=True)
+    if engine == 'PALETTE':
+        return _apply_palette_remaps(src_img, variant_obj, remap_pairs, tolerance)
+    if engine == 'SHARED':
+        return _apply_shared_remaps(base_obj, src_img, variant_obj, remap_pairs, tolerance)
+
+    remap_mat, reused = _get_remap_material(variant_obj, 'NODES')
+    nt = remap_mat.node_tree
+    tex, bsdf, out = _ensure_base_nodes(nt, reused)
+    if tex.image != src_img:
+        tex.image = src_img
+
+    # --- Sync Remap Chain: one shared stage group instance per pair ---
+    stages = _get_remap_stages(nt)
+    relink = not reused or len(stages) != len(remap_pairs)
+
+    for stage in stages[len(remap_pairs):]:
+        nt.nodes.remove(stage)
+    del stages[len(remap_pairs):]
+
+    stage_group = get_remap_stage_group()
+    for i in range(len(stages), len(remap_pairs)):
+        stage = nt.nodes.new("ShaderNodeGroup")
+        stage.node_tree = stage_group
+        stage.name = f"LV Stage {i}"
+        stage.location = (-500 + i * 200, -i * 60)
+        stages.append(stage)
+
+    # Only colors/tolerance changed → plain value writes, no relinking
+    _write_stage_values(stages, remap_pairs, tolerance)
+
+    if relink:
+        # Texture → stage 0 → ... → stage N-1 → BSDF
+        last_color_output = tex.outputs["Color"]
+        for stage in stages:
+            nt.links.new(last_color_output, stage.inputs["Color"])
+            last_color_output = stage.outputs["Color"]
+        nt.links.new(last_color_output, bsdf.inputs["Base Color"])
+
+        bsdf.location = (-200 + len(stages) * 200, 0)
+        out.location = (100 + len(stages) * 200, 0)
+
+    # --- Assign Material to Variant ---
+    _assign_remap_material(variant_obj, remap_mat)
+
+    action = "Updated" if reused else "Applied"
+    print(f"🎨 {action} {len(remap_pairs)} color remaps on '{variant_obj.name}' (tol={tolerance})")
+    return remap_mat
+
+
+def update_remap_values(variant_obj, remap_pairs, tolerance):
+    """
+    Patch colors and tolerance on the variant's remap material without
+    touching its node graph (used for live preview while editing).
+
+    Node-engine materials get new stage values; palette-engine materials get
+    their palette pixels rewritten, as long as the source colors, tolerance
+    and base texture content still match the label image.
+
+    Returns:
+        bool: True if the material was patched, False if the variant needs a
+        full apply (other engine, changed pair count or changed sources).
+    """
+    if not variant_obj or not variant_obj.data:
+        return False
+
+    for mat in variant_materials(variant_obj):
+        if not mat or not mat.use_nodes:
+            continue
+        nt = mat.node_tree
+        engine = mat.get("lv_engine")
+
+        if engine == 'NODES':
+            stages = _get_remap_stages(nt)
+            if len(stages) != len(remap_pairs):
+                return False
+            _write_stage_values(stages, remap_pairs, tolerance)
+            return True
+
+        if engine == 'PALETTE' and "LV Labels" in nt.nodes and "LV Palette" in nt.nodes:
+            label_img = nt.nodes["LV Labels"].image
+            palette_img = nt.nodes["LV Palette"].image
+            sources = [source_color for source_color, _ in remap_pairs]
+            src_img = nt.nodes["LV Texture"].image
+            if not palette_img or not src_img \
+                    or not label_image_matches(label_img, src_img, sources, tolerance):
+                return False
+            write_palette_image(palette_img.name, [t for _, t in remap_pairs])
+            return True
+
+        if engine == 'SHARED':
+            stages = _get_remap_stages(nt)
+            if len(remap_pairs) > len(stages):
+                return False
+            if not mat.get("lv_object_sources") and not all(
+                    _same_color(stage.inputs["Source"].default_value, source_color)
+                    for stage, (source_color, _) in zip(stages, remap_pairs)):
+                return False
+            _write_variant_attributes(variant_obj, remap_pairs, tolerance)
+            return True
+    return False
+
+
+def _apply_palette_remaps(src_img, variant_obj, remap_pairs, tolerance):
+    """
+    Assign a fixed-size shader that looks up each texel's target color in a
+    palette image, using the label map of the base texture.
+    """
+    sources = [source_color for source_color, _ in remap_pairs]
+    targets = [target_color for _, target_color in remap_pairs]
+    label_img = ensure_label_image(src_img, sources, tolerance)
+    palette_img = write_palette_image(f"{variant_obj.name}_Palette", targets)
+
+    remap_mat, reused = _get_remap_material(variant_obj, 'PALETTE')
+    nt = remap_mat.node_tree
+    tex, bsdf, out = _ensure_base_nodes(nt, reused)
+    if not (reused and "LV Palette" in nt.nodes):
+        _build_palette_nodes(nt, tex, bsdf)
+
+    for node_name, image in (("LV Texture", src_img), ("LV Labels", label_img),
+                             ("LV Palette", palette_img)):
+        if nt.nodes[node_name].image != image:
+            nt.nodes[node_name].image = image
+    _set_socket_value(nt.nodes["LV Palette Size"].outputs[0], float(palette_img.size[0]))
+
+    _assign_remap_material(variant_obj, remap_mat)
+
+    print(f"🎨 Applied {len(remap_pairs)} palette remaps to '{variant_obj.name}' (tol={tolerance})")
+    return remap_mat
+
+
+def _build_palette_nodes(nt, tex, bsdf):
+    """
+    Add the label → palette lookup between the base texture and the BSDF:
+
+        label  = (G * 256 + R) * 255          (from the label image)
+        target = palette((label + 0.5) / palette_size, 0.5)
+        color  = mix(texture, target, B)      (B = blend weight)
+    """
+    labels = nt.nodes.new("ShaderNodeTexImage")
+    split = nt.nodes.new("ShaderNodeSeparateColor")
+    combine_bytes = nt.nodes.new("ShaderNodeMath")
+    to_texel = nt.nodes.new("ShaderNodeMath")
+    size = nt.nodes.new("ShaderNodeValue")
+    to_u = nt.nodes.new("ShaderNodeMath")
+    uv = nt.nodes.new("ShaderNodeCombineXYZ")
+    palette = nt.nodes.new("ShaderNodeTexImage")
+    mix = nt.nodes.new("ShaderNodeMixRGB")
+
+    labels.name = "LV Labels"
+    size.name = "LV Palette Size"
+    palette.name = "LV Palette"
+    mix.name = "LV Palette Mix"
+
+    labels.location = (-800, -300)
+    split.location = (-500, -300)
+    combine_bytes.location = (-300, -250)
+    to_texel.location = (-100, -250)
+    size.location = (-100, -450)
+    to_u.location = (100, -300)
+    uv.location = (300, -300)
+    palette.location = (500, -300)
+    mix.location = (800, 0)
+    bsdf.location = (1000, 0)
+    nt.nodes["LV Output"].location = (1300, 0)
+
+    # Exact per-texel lookups: no filtering on labels or palette
+    labels.interpolation = 'Closest'
+    palette.interpolation = 'Closest'
+    palette.extension = 'EXTEND'
+
+    combine_bytes.operation = 'MULTIPLY_ADD'
+    combine_bytes.inputs[1].default_value = 256.0
+    to_texel.operation = 'MULTIPLY_ADD'
+    to_texel.inputs[1].default_value = 255.0
+    to_texel.inputs[2].default_value = 0.5
+    to_u.operation = 'DIVIDE'
+    uv.inputs["Y"].default_value = 0.5
+
+    nt.links.new(labels.outputs["Color"], split.inputs["Color"])
+    nt.links.new(split.outputs["Green"], combine_bytes.inputs[0])
+    nt.links.new(split.outputs["Red"], combine_bytes.inputs[2])
+    nt.links.new(combine_bytes.outputs["Value"], to_texel.inputs[0])
+    nt.links.new(to_texel.outputs["Value"], to_u.inputs[0])
+    nt.links.new(size.outputs["Value"], to_u.inputs[1])
+    nt.links.new(to_u.outputs["Value"], uv.inputs["X"])
+    nt.links.new(uv.outputs["Vector"], palette.inputs["Vector"])
+
+    nt.links.new(tex.outputs["Color"], mix.inputs[1])
+    nt.links.new(palette.outputs["Color"], mix.inputs[2])
+    nt.links.new(split.outputs["Blue"], mix.inputs["Fac"])
+    nt.links.new(mix.outputs["Color"], bsdf.inputs["Base Color"])
+
+
+def _apply_shared_remaps(base_obj, src_img, variant_obj, remap_pairs, tolerance):
+    """
+    Assign the base's shared remap material and write the variant's colors
+    into its custom properties.
+
+    The material has one stage per pair index (grown to the longest remap
+    list seen, never shrunk). Each stage reads its Target, Strength and
+    Tolerance from the rendering object through Attribute nodes; a variant
+    with fewer pairs leaves the extra strengths unset (0). Source colors are
+    stage defaults while all variants agree on them, and switch to per-object
+    attributes (one shader rebuild) the first time a variant differs.
+    """
+    remap_mat = _get_attribute_material(f"{base_obj.name}_SharedRemapMaterial", 'SHARED')
+    nt = remap_mat.node_tree
+    stages = _get_remap_stages(nt)
+    if not remap_mat.get("lv_object_sources") and not all(
+            _same_color(stage.inputs["Source"].default_value, source_color)
+            for stage, (source_color, _) in zip(stages, remap_pairs)):
+        remap_mat["lv_object_sources"] = True
+
+    _sync_attribute_stages(remap_mat, src_img, [s for s, _ in remap_pairs], 'OBJECT')
+    _write_variant_attributes(variant_obj, remap_pairs, tolerance)
+    _assign_remap_material(variant_obj, remap_mat)
+
+    print(f"🎨 Shared '{remap_mat.name}' with '{variant_obj.name}' "
+          f"({len(remap_pairs)} remaps, tol={tolerance})")
+    return remap_mat
+
+
+def get_instancer_remap_material(base_obj, stage_count):
+    """
+    Return "<base>_LineupMaterial": the base texture through `stage_count`
+    remap stages that read all their inputs (SHARED_SOURCE, SHARED_TARGET,
+    SHARED_STRENGTH, SHARED_TOLERANCE) from the instance attributes of a
+    Geometry Nodes instancer (see variant_lineup.py).
+
+    Returns:
+        Material: The lineup material, or None if the base has no texture.
+    """
+    src_img = base_source_image(base_obj)
     if not src_img:
         print("❌ No texture image found in base material.")
         return None
 
-    # --- Create new remap material ---
-    remap_mat = bpy.data.materials.new(name=f"{variant_obj.name}_RemapMaterial")
+    remap_mat = _get_attribute_material(f"{base_obj.name}_LineupMaterial", 'LINEUP')
+    remap_mat["lv_object_sources"] = True
+    _sync_attribute_stages(remap_mat, src_img, [(0.0, 0.0, 0.0, 1.0)] * stage_count,
+                           'INSTANCER')
+    return remap_mat
+
+
+def _sync_attribute_stages(remap_mat, src_img, source_colors, attribute_type):
+    """
+    Grow the remap chain of an attribute-driven material to
+    len(source_colors) stages (never shrinking it) and wire each stage's
+    inputs to Attribute nodes of `attribute_type`.
+
+    New stages get `source_colors` as their Source default; with the
+    material's "lv_object_sources" flag set, Source is read per object too.
+    """
+    nt = remap_mat.node_tree
+    tex, bsdf, out = _ensure_base_nodes(nt, "LV Texture" in nt.nodes)
+    if tex.image != src_img:
+        tex.image = src_img
+
+    stages = _get_remap_stages(nt)
+    stage_group = get_remap_stage_group()
+    tolerance_attr = _ensure_attribute_node(nt, "LV Tolerance", SHARED_TOLERANCE,
+                                            attribute_type, (-1000, 200))
+    relink = False
+    for i in range(len(stages), len(source_colors)):
+        stage = nt.nodes.new("ShaderNodeGroup")
+        stage.node_tree = stage_group
+        stage.name = f"LV Stage {i}"
+        stage.location = (-500 + i * 200, -i * 60)
+        _set_socket_value(stage.inputs["Source"], source_colors[i])
+        stages.append(stage)
+        relink = True
+
+    object_sources = bool(remap_mat.get("lv_object_sources"))
+    for i, stage in enumerate(stages):
+        x, y = stage.location[0], stage.location[1] - 250
+        target = _ensure_attribute_node(nt, f"LV Target {i}", SHARED_TARGET.format(i),
+                                        attribute_type, (x, y))
+        strength = _ensure_attribute_node(nt, f"LV Strength {i}", SHARED_STRENGTH.format(i),
+                                          attribute_type, (x, y - 150))
+        nt.links.new(target.outputs["Color"], stage.inputs["Target"])
+        nt.links.new(strength.outputs["Fac"], stage.inputs["Strength"])
+        nt.links.new(tolerance_attr.outputs["Fac"], stage.inputs["Tolerance"])
+        if object_sources:
+            source = _ensure_attribute_node(nt, f"LV Source {i}", SHARED_SOURCE.format(i),
+                                            attribute_type, (x, y - 300))
+            nt.links.new(source.outputs["Color"], stage.inputs["Source"])
+
+    if relink:
+        # Texture → stage 0 → ... → stage N-1 → BSDF
+        last_color_output = tex.outputs["Color"]
+        for stage in stages:
+            nt.links.new(last_color_output, stage.inputs["Color"])
+            last_color_output = stage.outputs["Color"]
+        nt.links.new(last_color_output, bsdf.inputs["Base Color"])
+
+        bsdf.location = (-200 + len(stages) * 200, 0)
+        out.location = (100 + len(stages) * 200, 0)
+
+
+def _get_attribute_material(name, engine):
+    """Return the attribute-driven remap material `name`, creating it on first use."""
+    remap_mat = bpy.data.materials.get(name)
+    if remap_mat and remap_mat.get("lv_engine") == engine and remap_mat.use_nodes:
+        return remap_mat
+
+    remap_mat = bpy.data.materials.new(name=name)
     remap_mat.use_nodes = True
+    remap_mat.node_tree.nodes.clear()
+    remap_mat["lv_engine"] = engine
+    return remap_mat
+
+
+def _ensure_attribute_node(nt, name, attribute_name, attribute_type, location):
+    """Return the Attribute node `name` reading `attribute_name` of `attribute_type`."""
+    node = nt.nodes.get(name)
+    if node is None:
+        node = nt.nodes.new("ShaderNodeAttribute")
+        node.name = name
+        node.location = location
+    if node.attribute_type != attribute_type:
+        node.attribute_type = attribute_type
+    if node.attribute_name != attribute_name:
+        node.attribute_name = attribute_name
+    return node
+
+
+def _write_variant_attributes(variant_obj, remap_pairs, tolerance):
+    """Store the variant's remap colors as the custom properties the shared material reads."""
+    for i, (source_color, target_color) in enumerate(remap_pairs):
+        variant_obj[SHARED_SOURCE.format(i)] = [float(c) for c in source_color]
+        variant_obj[SHARED_TARGET.format(i)] = [float(c) for c in target_color]
+        variant_obj[SHARED_STRENGTH.format(i)] = 1.0
+    variant_obj[SHARED_TOLERANCE] = float(tolerance)
+
+    # Drop pairs left over from a longer remap list
+    i = len(remap_pairs)
+    while SHARED_STRENGTH.format(i) in variant_obj:
+        for key in (SHARED_SOURCE, SHARED_TARGET, SHARED_STRENGTH):
+            variant_obj.pop(key.format(i), None)
+        i += 1
+
+    variant_obj.update_tag()
+
+
+def _apply_baked_remaps(src_img, variant_obj, remap_pairs, tolerance, lut=None,
+                        use_label_map=False):
+    """
+    Bake the remaps into a new image, or load an identical earlier bake from
+    the bake cache, and assign a texture → BSDF material.
+    """
+    name = f"{variant_obj.name}_RemapTex"
+    engine = 'LUT' if lut is not None else 'LABELS' if use_label_map else 'BAKE'
+    key = bake_key(src_img, remap_pairs, tolerance, engine, lut)
+    started = time.perf_counter()
+    baked_img = load_cached_bake(key, src_img, name) if key else None
+
+    if baked_img is not None:
+        # Report the load, not the stats of whatever was baked last
+        last_bake_stats.clear()
+        last_bake_stats.update(image=baked_img.name, cached=True,
+                               seconds=time.perf_counter() - started)
+    else:
+        table, domain = (lut[0], lut[1:]) if lut is not None else (None, (0.0, 1.0))
+        pending = pending_path(key, src_img.is_float) if key else None
+        baked_img = bake_remapped_image(
+            src_img, remap_pairs, tolerance, name=name,
+            lut=table, lut_domain=domain, use_label_map=use_label_map,
+            save_to=pending,
+        )
+        if baked_img:
+            commit_bake(pending, key, src_img.is_float)
+    if not baked_img:
+        return None
+
+    remap_mat = _show_baked_image(variant_obj, baked_img)
+    print(f"🎨 Baked {len(remap_pairs)} color remaps for '{variant_obj.name}' (tol={tolerance})")
+    return remap_mat
+
+
+def _show_baked_image(variant_obj, baked_img):
+    """Assign the variant a texture → BSDF material showing `baked_img`."""
+    remap_mat, reused = _get_remap_material(variant_obj, 'BAKE')
     nt = remap_mat.node_tree
-    nt.nodes.clear()
+    tex, bsdf, out = _ensure_base_nodes(nt, reused)
+    if tex.image != baked_img:
+        tex.image = baked_img
 
-    # --- Base Nodes ---
-    out = nt.nodes.new("ShaderNodeOutputMaterial")
-    bsdf = nt.nodes.new("ShaderNodeBsdfPrincipled")
+    _assign_remap_material(variant_obj, remap_mat)
+    return remap_mat
+
+
+def start_background_bake(base_obj, variant_obj, remap_pairs, tolerance=0.1, engine='BAKE',
+                          lut=None, lut_size=33):
+    """
+    Start baking the remaps on a worker thread (see remap_bake.BakeJob) and
+    show the job's preview image on the variant while it fills in.
+
+    The preview lives in a temporary material, so the variant's own
+    materials stay untouched until the bake succeeds. Drive the returned job
+    from a timer or modal operator: call job.poll() until it returns True,
+    then finish_background_bake(); or cancel_background_bake() to abort.
+    Both need the variant's materials from before the bake
+    (texture_setup.variant_materials) to put back.
+
+    Args:
+        engine (str): 'BAKE', 'LUT' or 'LABELS', as in apply_color_remaps().
+        Other arguments: See apply_color_remaps().
+
+    Returns:
+        BakeJob: The running job, or None if nothing can be baked.
+    """
+    if not (base_obj and variant_obj):
+        print("❌ Both base and variant objects are required.")
+        return None
+
+    src_img = base_source_image(base_obj)
+    if not src_img:
+        print("❌ No texture image found in base material.")
+        return None
+    if not all(src_img.size):
+        print(f"❌ Image '{src_img.name}' has no pixel data.")
+        return None
+    if engine not in {'BAKE', 'LUT', 'LABELS'}:
+        print(f"❌ Engine '{engine}' does not bake pixels.")
+        return None
+
+    if engine == 'LUT' and lut is None:
+        lut = (build_lut(remap_pairs, tolerance, lut_size), 0.0, 1.0)
+    table, domain = (lut[0], lut[1:]) if lut is not None else (None, (0.0, 1.0))
+
+    job = BakeJob(
+        src_img, remap_pairs, tolerance, name=f"{variant_obj.name}_RemapTex",
+        lut=table if engine == 'LUT' else None, lut_domain=domain,
+        use_label_map=engine == 'LABELS',
+    )
+    preview_mat = bpy.data.materials.get(f"{variant_obj.name}_BakePreview") \
+        or bpy.data.materials.new(name=f"{variant_obj.name}_BakePreview")
+    preview_mat.use_nodes = True
+    tex, bsdf, out = _ensure_base_nodes(preview_mat.node_tree, False)
+    tex.image = job.image
+    _assign_remap_material(variant_obj, preview_mat)
+    job.preview_material = preview_mat.name
+    return job.start()
+
+
+def finish_background_bake(job, variant_obj, previous_materials):
+    """
+    Finish a background bake once job.poll() returned True: replace the
+    preview with the variant's texture → BSDF remap material showing the
+    baked image, or restore `previous_materials` if the bake failed.
+
+    Returns:
+        Material: The remap material, or None on failure.
+    """
+    baked_img = job.finish()
+    _end_bake_preview(job, variant_obj, previous_materials)
+    if baked_img is None or variant_obj is None:
+        return None
+    return _show_baked_image(variant_obj, baked_img)
+
+
+def cancel_background_bake(job, variant_obj, previous_materials):
+    """Stop a background bake and give the variant back `previous_materials`."""
+    job.cancel()
+    _end_bake_preview(job, variant_obj, previous_materials)
+
+
+def _end_bake_preview(job, variant_obj, previous_materials):
+    """
+    Restore the variant's materials, if it still exists, and delete the
+    job's temporary preview material either way.
+    """
+    if variant_obj is not None:
+        assign_variant_materials(variant_obj, previous_materials)
+    preview_mat = bpy.data.materials.get(job.preview_material or "")
+    if preview_mat is not None:
+        bpy.data.materials.remove(preview_mat)
+
+
+def apply_color_remap_batch(base_obj, variant_objs, remap_lists, tolerance=0.1,
+                            processes=None):
+    """
+    Bake one colorway per variant in a process pool (see
+    remap_bake.bake_variant_batch) and give each variant a texture → BSDF
+    material showing its image. Colorways already in the bake cache are
+    loaded instead of baked.
+
+    Args:
+        base_obj (Object): The base mesh object containing the source material.
+        variant_objs (list[Object]): One variant per entry of `remap_lists`.
+        remap_lists (list[list]): Remap pairs for each variant.
+        tolerance (float): Color distance threshold for blending (0.01–0.5).
+        processes (int): Worker processes (default: the bake thread setting).
+
+    Returns:
+        list[Material]: The remap materials, in `variant_objs` order.
+    """
+    if len(variant_objs) != len(remap_lists):
+        print("❌ Need exactly one remap list per variant.")
+        return []
+
+    src_img = base_source_image(base_obj) if base_obj else None
+    if not src_img:
+        print("❌ No texture image found in base material.")
+        return []
+
+    # Load unchanged colorways from the bake cache, bake only the rest
+    names = [f"{variant_obj.name}_RemapTex" for variant_obj in variant_objs]
+    keys = [bake_key(src_img, remap_pairs, tolerance, 'BAKE') for remap_pairs in remap_lists]
+    images = [load_cached_bake(key, src_img, name) if key else None
+              for key, name in zip(keys, names)]
+
+    missing = [i for i, img in enumerate(images) if img is None]
+    if missing:
+        pending = [pending_path(keys[i], src_img.is_float) if keys[i] else None
+                   for i in missing]
+        baked = bake_variant_batch(
+            src_img, [remap_lists[i] for i in missing], tolerance,
+            names=[names[i] for i in missing],
+            processes=processes,
+            save_to=pending,
+        )
+        for i, img, path in zip(missing, baked, pending):
+            images[i] = img
+            if img:
+                commit_bake(path, keys[i], src_img.is_float)
+
+    materials = [_show_baked_image(variant_obj, img)
+                 for variant_obj, img in zip(variant_objs, images)]
+    print(f"🎨 Baked {len(materials)} colorways of '{base_obj.name}' (tol={tolerance})")
+    return materials
+
+
+# -----------------------------------------------------
+# MATERIAL REUSE
+# -----------------------------------------------------
+
+def _get_remap_material(variant_obj, engine):
+    """
+    Return (material, reused) for the variant's remap material.
+
+    The material assigned by a previous apply is reused so re-applying does
+    not allocate a new datablock. `reused` is True when its node tree was
+    already built for `engine` and can be updated in place.
+    """
+    remap_mat = None
+    materials = variant_materials(variant_obj)
+    for mat in materials:
+        if mat and "lv_engine" in mat:
+            remap_mat = mat
+            break
+
+    # Never edit a remap material other objects rely on (each slot showing
+    # it counts as a user)
+    if remap_mat and remap_mat.users > materials.count(remap_mat):
+        remap_mat = None
+
+    if remap_mat is None:
+        remap_mat = bpy.data.materials.new(name=f"{variant_obj.name}_RemapMaterial")
+
+    if remap_mat.get("lv_engine") == engine and remap_mat.use_nodes:
+        return remap_mat, True
+
+    remap_mat.use_nodes = True
+    remap_mat.node_tree.nodes.clear()
+    remap_mat["lv_engine"] = engine
+    return remap_mat, False
+
+
+def _ensure_base_nodes(nt, reused):
+    """Return the (texture, BSDF, output) nodes, creating them if needed."""
+    names = ("LV Texture", "LV BSDF", "LV Output")
+    if reused and all(name in nt.nodes for name in names):
+        return tuple(nt.nodes[name] for name in names)
+
+    nt.nodes.clear()
     tex = nt.nodes.new("ShaderNodeTexImage")
-    tex.image = src_img
+    bsdf = nt.nodes.new("ShaderNodeBsdfPrincipled")
+    out = nt.nodes.new("ShaderNodeOutputMaterial")
+    for node, name in zip((tex, bsdf, out), names):
+        node.name = name
 
     tex.location = (-800, 0)
-    bsdf.location = (600, 0)
-    out.location = (900, 0)
+    bsdf.location = (0, 0)
+    out.location = (300, 0)
 
-    # Start with texture color as base
-    last_color_output = tex.outputs["Color"]
-
-    # --- Build Remap Chain for Each Color Pair ---
-    for i, (source_color, target_color) in enumerate(remap_pairs):
-        src_col = nt.nodes.new("ShaderNodeRGB")
-        tgt_col = nt.nodes.new("ShaderNodeRGB")
-        dist = nt.nodes.new("ShaderNodeVectorMath")
-        div = nt.nodes.new("ShaderNodeMath")
-        sub = nt.nodes.new("ShaderNodeMath")
-        clamp = nt.nodes.new("ShaderNodeClamp")
-        mix = nt.nodes.new("ShaderNodeMixRGB")
-
-        # Position nodes for readability
-        offset_y = -i * 250
-        src_col.location = (-600, 200 + offset_y)
-        tgt_col.location = (-600, -100 + offset_y)
-        dist.location = (-350, 50 + offset_y)
-        div.location = (-100, 50 + offset_y)
-        sub.location = (150, 50 + offset_y)
-        clamp.location = (400, 50 + offset_y)
-        mix.location = (250, -200 + offset_y)
-
-        # Assign node values
-        src_col.outputs[0].default_value = source_color
-        tgt_col.outputs[0].default_value = target_color
-        dist.operation = 'DISTANCE'
-        div.operation = 'DIVIDE'
-        sub.operation = 'SUBTRACT'
-
-        # --- Build subnetwork for one color remap ---
-        nt.links.new(last_color_output, dist.inputs[0])
-        nt.links.new(src_col.outputs["Color"], dist.inputs[1])
-        div.inputs[1].default_value = max(tolerance, 1e-5)
-        nt.links.new(dist.outputs["Value"], div.inputs[0])
-        sub.inputs[0].default_value = 1.0
-        nt.links.new(div.outputs["Value"], sub.inputs[1])
-        nt.links.new(sub.outputs["Value"], clamp.inputs["Value"])
-        nt.links.new(last_color_output, mix.inputs[1])
-        nt.links.new(tgt_col.outputs["Color"], mix.inputs[2])
-        nt.links.new(clamp.outputs["Result"], mix.inputs["Fac"])
-
-        # This mix becomes the new color output for next iteration
-        last_color_output = mix.outputs["Color"]
-
-    # --- Connect Final Output to BSDF ---
-    nt.links.new(last_color_output, bsdf.inputs["Base Color"])
+    nt.links.new(tex.outputs["Color"], bsdf.inputs["Base Color"])
     nt.links.new(bsdf.outputs["BSDF"], out.inputs["Surface"])
+    return tex, bsdf, out
 
-    # --- Assign Material to Variant ---
-    variant_obj.data.materials.clear()
-    variant_obj.data.materials.append(remap_mat)
 
-    print(f"🎨 Applied {len(remap_pairs)} color remaps to '{variant_obj.name}' (tol={tolerance})")
-    return remap_mat
+def _get_remap_stages(nt):
+    """Return the remap stage nodes of a node tree, in chain order."""
+    stages = []
+    while f"LV Stage {len(stages)}" in nt.nodes:
+        stages.append(nt.nodes[f"LV Stage {len(stages)}"])
+    return stages
+
+
+def _write_stage_values(stages, remap_pairs, tolerance):
+    """Write Source/Target/Tolerance values onto existing stage nodes."""
+    for stage, (source_color, target_color) in zip(stages, remap_pairs):
+        _set_socket_value(stage.inputs["Source"], source_color)
+        _set_socket_value(stage.inputs["Target"], target_color)
+        _set_socket_value(stage.inputs["Tolerance"], tolerance)
+
+
+def _same_color(a, b):
+    """True if two colors match within float noise."""
+    return all(abs(x - y) <= 1e-6 for x, y in zip(a, b))
+
+
+def _set_socket_value(socket, value):
+    """Write a socket default only if it changed, to avoid needless updates."""
+    current = socket.default_value
+    if isinstance(value, (int, float)):
+        changed = abs(current - value) > 1e-6
+    else:
+        changed = any(abs(a - b) > 1e-6 for a, b in zip(current, value))
+    if changed:
+        socket.default_value = value
+
+
+def _assign_remap_material(variant_obj, remap_mat):
+    """Make `remap_mat` the variant's only material, if it isn't already."""
+    assign_variant_materials(variant_obj, [remap_mat])
 
 
 # Optional test
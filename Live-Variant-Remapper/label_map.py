@@ -0,0 +1,151 @@
+"""
+label_map.py
+
+Per-texel "which source color does this texel match, and how strongly" map.
+
+Classifying texels is the expensive part of a remap, and it only depends on
+the source colors and tolerance. Once a label map is computed for a texture,
+changing target colors is a cheap palette gather with no distance math:
+
+    color = color + weight * (palette[label] - color)
+
+Each texel is matched against its nearest source color only, so the result
+equals the sequential node chain as long as source colors are more than
+2 × tolerance apart and no target color falls within tolerance of another
+source. Like pixel_remap.py, this module does not import bpy.
+
+Usage example:
+
+    import label_map as lm
+    labels = lm.compute_label_map(pixels, [src for src, _ in remap_pairs], 0.1)
+    lm.recolor_pixels(pixels, labels, [tgt for _, tgt in remap_pairs])
+"""
+
+import numpy as np
+
+
+class LabelMap:
+    """
+    Compact per-texel match data for one texture.
+
+    Attributes:
+        labels (ndarray): uint8/uint16 per texel; 0 = no match, i + 1 = source i.
+        weights (ndarray): float16 per texel blend weight in [0, 1].
+        sources (tuple): Source colors the map was computed for.
+        tolerance (float): Tolerance the map was computed for.
+    """
+
+    __slots__ = ("labels", "weights", "sources", "tolerance")
+
+    def __init__(self, labels, weights, sources, tolerance):
+        self.labels = labels
+        self.weights = weights
+        self.sources = sources
+        self.tolerance = tolerance
+
+    def matches(self, sources, tolerance):
+        """True if this map was computed for the given sources and tolerance."""
+        return self.sources == source_key(sources) and abs(self.tolerance - tolerance) < 1e-6
+
+    def band(self, start, stop):
+        """View of the map for texels [start, stop)."""
+        return LabelMap(self.labels[start:stop], self.weights[start:stop],
+                        self.sources, self.tolerance)
+
+    @property
+    def nbytes(self):
+        return self.labels.nbytes + self.weights.nbytes
+
+
+def source_key(sources):
+    """Hashable, rounded form of a list of source colors (RGB only)."""
+    return tuple(tuple(round(float(c), 6) for c in src[:3]) for src in sources)
+
+
+def label_dtype(source_count):
+    """Smallest unsigned dtype that can hold `source_count` labels plus 0."""
+    return np.uint8 if source_count < 255 else np.uint16
+
+
+def compute_label_map(pixels, sources, tolerance=0.1):
+    """
+    Classify every texel of an (N, 4) scene-linear RGBA array.
+
+    Args:
+        pixels (ndarray): (N, 4) float32 scene-linear RGBA pixels.
+        sources (list[tuple]): Source colors (R,G,B[,A]).
+        tolerance (float): Color distance threshold.
+
+    Returns:
+        LabelMap: Nearest source index and blend weight for every texel.
+    """
+    rgb = pixels[:, :3]
+    count = len(rgb)
+
+    best_dist = np.full(count, np.inf, dtype=np.float32)
+    labels = np.zeros(count, dtype=label_dtype(len(sources)))
+    diff = np.empty(rgb.shape, dtype=np.float32)
+    dist = np.empty(count, dtype=np.float32)
+
+    for i, source_color in enumerate(sources):
+        src = np.asarray(source_color[:3], dtype=np.float32)
+        np.subtract(rgb, src, out=diff)
+        np.multiply(diff, diff, out=diff)
+        np.sum(diff, axis=1, out=dist)
+        closer = dist < best_dist
+        best_dist[closer] = dist[closer]
+        labels[closer] = i + 1
+
+    # weight = clamp(1 - distance / tolerance, 0, 1), as in the node chain
+    np.sqrt(best_dist, out=best_dist)
+    best_dist *= -1.0 / max(tolerance, 1e-5)
+    best_dist += 1.0
+    np.clip(best_dist, 0.0, 1.0, out=best_dist)
+    labels[best_dist == 0.0] = 0
+
+    return LabelMap(labels, best_dist.astype(np.float16), source_key(sources), tolerance)
+
+
+def encode_label_pixels(label_map):
+    """
+    Pack a label map into (N, 4) float32 RGBA values for an 8-bit image:
+    R/G = low/high byte of the label, B = blend weight, A = 1.
+    """
+    labels = label_map.labels
+    rgba = np.empty((len(labels), 4), dtype=np.float32)
+    rgba[:, 0] = labels & 0xFF
+    rgba[:, 1] = labels >> 8
+    rgba[:, :2] /= 255.0
+    rgba[:, 2] = label_map.weights
+    rgba[:, 3] = 1.0
+    return rgba
+
+
+def build_palette(targets):
+    """(K + 1, 3) float32 palette; row 0 is unused (unmatched texels)."""
+    palette = np.zeros((len(targets) + 1, 3), dtype=np.float32)
+    for i, target_color in enumerate(targets):
+        palette[i + 1] = target_color[:3]
+    return palette
+
+
+def recolor_pixels(pixels, label_map, targets):
+    """
+    Blend each matched texel toward its target color, in place.
+
+    Args:
+        pixels (ndarray): (N, 4) float32 scene-linear RGBA base pixels.
+        label_map (LabelMap): Map computed for these pixels.
+        targets (list[tuple]): Target colors, one per source.
+
+    Returns:
+        ndarray: The same `pixels` array, recolored.
+    """
+    rgb = pixels[:, :3]
+    palette = build_palette(targets)
+
+    delta = palette[label_map.labels]
+    delta -= rgb
+    delta *= label_map.weights[:, None]
+    rgb += delta
+    return pixels
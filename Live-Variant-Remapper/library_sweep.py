@@ -0,0 +1,254 @@
+"""
+library_sweep.py
+
+Regenerates the registered variants (see multi_remap_controller.py) of every
+.blend file in an asset library, using a pool of long-lived background
+Blender processes.
+
+Run the driver with a regular Python interpreter:
+
+    python library_sweep.py /assets/library --workers 4 \\
+        --blender /opt/blender/blender --log sweep_logs
+
+The driver serves a work queue of file paths on localhost. Each worker is a
+`blender -b` process running this script in worker mode: it takes a file
+from the queue, opens it, regenerates its variants, saves it and reports
+back, until the queue is empty. Each worker bakes on --bake-threads
+threads (default: the CPU cores split between the workers), so the sweep
+never runs more bake threads or processes than there are cores.
+
+Per-file results go to <log>/sweep.jsonl, each worker's console output to
+<log>/worker_<i>.log, and a throughput summary is printed at the end. Files in progress when a
+worker dies are reported as failed. The exit code is 0 when every file
+succeeded, else 1.
+"""
+
+import argparse
+import json
+import os
+import queue
+import secrets
+import subprocess
+import sys
+import threading
+import time
+from multiprocessing.managers import BaseManager
+
+# Blender does not put a --python script's folder on sys.path
+_SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+if _SCRIPT_DIR not in sys.path:
+    sys.path.insert(0, _SCRIPT_DIR)
+
+AUTHKEY_ENV = "LV_SWEEP_AUTHKEY"
+
+
+class _DriverManager(BaseManager):
+    pass
+
+
+class _WorkerManager(BaseManager):
+    pass
+
+
+_WorkerManager.register("jobs")
+_WorkerManager.register("results")
+
+
+# -----------------------------------------------------
+# WORKER (inside `blender -b`)
+# -----------------------------------------------------
+
+def process_file(filepath):
+    """
+    Open a .blend file, regenerate its registered variants and save it.
+
+    Returns:
+        dict: Result with file, status, variants, failed_variants, error
+        and seconds.
+    """
+    import bpy
+    from remap_bake import clear_caches
+    from multi_remap_controller import regenerate_registered_variants
+
+    started = time.perf_counter()
+    result = {"file": filepath, "status": "failed", "variants": 0,
+              "failed_variants": [], "error": None}
+    try:
+        clear_caches()
+        bpy.ops.wm.open_mainfile(filepath=filepath, load_ui=False)
+        regenerated, failed = regenerate_registered_variants()
+        result["variants"] = len(regenerated)
+        result["failed_variants"] = failed
+        if regenerated:
+            bpy.ops.wm.save_mainfile()
+        if failed:
+            raise RuntimeError(f"{len(failed)} variants failed to regenerate")
+        result["status"] = "ok"
+    except Exception as e:
+        result["error"] = f"{type(e).__name__}: {e}"
+        print(f"❌ {filepath}: {result['error']}")
+
+    result["seconds"] = round(time.perf_counter() - started, 4)
+    return result
+
+
+def run_worker(address, bake_threads=1):
+    """Take files from the driver's queue until it hands out None."""
+    from remap_bake import configure
+
+    # The other workers bake at the same time; 0 would take every core
+    configure(threads=max(1, bake_threads))
+
+    host, port = address.rsplit(":", 1)
+    manager = _WorkerManager(address=(host, int(port)),
+                             authkey=os.environ[AUTHKEY_ENV].encode())
+    manager.connect()
+    jobs, results = manager.jobs(), manager.results()
+
+    while True:
+        filepath = jobs.get()
+        if filepath is None:
+            break
+        results.put({"event": "start", "file": filepath, "worker": os.getpid()})
+        result = process_file(filepath)
+        result.update(event="done", worker=os.getpid())
+        results.put(result)
+
+
+# -----------------------------------------------------
+# DRIVER
+# -----------------------------------------------------
+
+def find_blend_files(paths):
+    """Return every .blend file under `paths`, sorted."""
+    found = []
+    for path in paths:
+        if os.path.isfile(path):
+            found.append(os.path.abspath(path))
+            continue
+        for root, _, names in os.walk(path):
+            found.extend(os.path.join(root, n) for n in names if n.endswith(".blend"))
+    return sorted(found)
+
+
+def sweep(files, blender="blender", workers=4, log_dir="sweep_logs", bake_threads=None):
+    """
+    Regenerate variants in `files` with `workers` background Blender processes,
+    each baking on `bake_threads` threads (default: the CPU cores split
+    between the workers).
+
+    Returns:
+        list[dict]: One result per file (see process_file), in completion order.
+    """
+    os.makedirs(log_dir, exist_ok=True)
+    jobs, results = queue.Queue(), queue.Queue()
+    for filepath in files:
+        jobs.put(filepath)
+    for _ in range(workers):
+        jobs.put(None)
+
+    # Serve the queues from a thread of this process
+    authkey = secrets.token_hex(16)
+    _DriverManager.register("jobs", callable=lambda: jobs)
+    _DriverManager.register("results", callable=lambda: results)
+    server = _DriverManager(address=("127.0.0.1", 0), authkey=authkey.encode()).get_server()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    address = f"{server.address[0]}:{server.address[1]}"
+
+    if not bake_threads:
+        bake_threads = max(1, (os.cpu_count() or 1) // workers)
+
+    env = dict(os.environ, **{AUTHKEY_ENV: authkey})
+    processes = []
+    for i in range(workers):
+        log = open(os.path.join(log_dir, f"worker_{i}.log"), "w", encoding="utf-8")
+        processes.append((subprocess.Popen(
+            [blender, "-b", "--factory-startup", "--python", os.path.abspath(__file__),
+             "--", "--worker", address, "--bake-threads", str(bake_threads)],
+            stdout=log, stderr=subprocess.STDOUT, env=env,
+        ), log))
+
+    started = time.perf_counter()
+    in_progress = {}  # worker pid → file
+    done = []
+    with open(os.path.join(log_dir, "sweep.jsonl"), "w", encoding="utf-8") as sweep_log:
+
+        def record(result):
+            done.append(result)
+            sweep_log.write(json.dumps(result) + "\n")
+            sweep_log.flush()
+            mark = "✅" if result["status"] == "ok" else "❌"
+            print(f"{mark} [{len(done)}/{len(files)}] {result['file']} "
+                  f"({result['variants']} variants, {result['seconds']:.1f}s)")
+
+        while len(done) < len(files):
+            try:
+                message = results.get(timeout=1.0)
+            except queue.Empty:
+                if all(p.poll() is not None for p, _ in processes):
+                    break  # every worker exited; nothing more will arrive
+                continue
+            if message.pop("event") == "start":
+                in_progress[message["worker"]] = message["file"]
+            else:
+                in_progress.pop(message["worker"], None)
+                record(message)
+
+        # Files a crashed worker was holding, or that no worker got to
+        finished = {r["file"] for r in done}
+        for filepath in files:
+            if filepath not in finished:
+                crashed = filepath in in_progress.values()
+                record({"file": filepath, "status": "failed", "variants": 0,
+                        "failed_variants": [], "seconds": 0.0,
+                        "error": "worker crashed" if crashed else "not processed"})
+
+    for process, log in processes:
+        process.wait()
+        log.close()
+
+    seconds = time.perf_counter() - started
+    failed = [r for r in done if r["status"] != "ok"]
+    variants = sum(r["variants"] for r in done)
+    print(f"📋 {len(done) - len(failed)}/{len(done)} files, {variants} variants in "
+          f"{seconds:.1f}s ({len(done) / max(seconds, 1e-9):.2f} files/s, "
+          f"{variants / max(seconds, 1e-9):.2f} variants/s) on {workers} workers")
+    for r in failed:
+        print(f"   ❌ {r['file']}: {r['error']}")
+    return done
+
+
+def main(argv=None):
+    """Parse arguments and run as driver or (inside Blender) as worker."""
+    if argv is None:
+        argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else sys.argv[1:]
+
+    parser = argparse.ArgumentParser(
+        prog="library_sweep.py",
+        description="Regenerate registered color variants across a library of .blend files.",
+    )
+    parser.add_argument("paths", nargs="*", help=".blend files or folders to sweep")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="Background Blender processes (default: one per CPU core)")
+    parser.add_argument("--blender", default="blender", help="Blender executable")
+    parser.add_argument("--bake-threads", type=int,
+                        help="Bake threads / processes per worker (default: CPU cores / workers)")
+    parser.add_argument("--log", default="sweep_logs", help="Folder for results and worker logs")
+    parser.add_argument("--worker", metavar="ADDRESS", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.worker:
+        run_worker(args.worker, args.bake_threads or 1)
+        return 0
+
+    files = find_blend_files(args.paths)
+    if not files:
+        print("⚠️ No .blend files found.")
+        return 1
+    results = sweep(files, args.blender, max(1, min(args.workers, len(files))), args.log,
+                    args.bake_threads)
+    return 0 if all(r["status"] == "ok" for r in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
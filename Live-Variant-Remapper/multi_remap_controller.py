@@ -17,13 +17,21 @@ Usage Example:
     ]
 
     apply_multi_remap(base, variant, remaps)
+
+Every variant made this way is linked to its base and remembers its remaps,
+tolerance and engine in the variant registry (see variant_registry.py), so a
+whole file can be refreshed later with regenerate_registered_variants()
+(see library_sweep.py).
 """
 
 import bpy
-from color_remap import apply_color_remaps
+from color_remap import apply_color_remaps, apply_color_remap_batch
+from texture_setup import assign_variant_materials
+from variant_registry import link_variant, store_remaps, registered_variants
 
 
-def apply_multi_remap(base_obj, variant_obj, remap_list, tolerance=0.08):
+def apply_multi_remap(base_obj, variant_obj, remap_list, tolerance=0.08, engine='NODES',
+                      lut_size=33):
     """
     Apply one or more color remaps from `remap_list` to the variant object.
 
@@ -32,27 +40,108 @@ def apply_multi_remap(base_obj, variant_obj, remap_list, tolerance=0.08):
         variant_obj (Object): The variant mesh object to modify.
         remap_list (list): List of ((R,G,B,A), (R,G,B,A)) remap pairs.
         tolerance (float): Color match threshold (default 0.08).
+        engine (str): 'NODES' for a live node chain, 'BAKE' to bake the
+            remapped colors into a new texture, 'LUT' to bake through a
+            compiled 3D lookup table, 'LABELS' to bake through a cached
+            per-texel label map, 'PALETTE' for a label map + palette shader,
+            'SHARED' for one node material per base driven by per-variant
+            custom properties.
+        lut_size (int): Lookup table resolution for the 'LUT' engine.
 
     Behavior:
         - If no remap list is defined → variant gets same color as base.
         - If defined → applies all remaps in a single optimized material.
+
+    Returns:
+        Material: The material assigned to the variant, or None on failure.
     """
     if not base_obj or not variant_obj:
         print("❌ Both base and variant objects must be provided.")
-        return
+        return None
 
     if not remap_list:
         print("⚠️ No remaps defined — assigning base material to variant.")
-        if base_obj.active_material:
-            mat_copy = base_obj.active_material.copy()
-            variant_obj.data.materials.clear()
-            variant_obj.data.materials.append(mat_copy)
-        return
+        if not base_obj.active_material:
+            return None
+        mat_copy = base_obj.active_material.copy()
+        assign_variant_materials(variant_obj, [mat_copy])
+        register_variant(base_obj, variant_obj, remap_list, tolerance, engine, lut_size)
+        return mat_copy
 
     print(f"🎨 Applying {len(remap_list)} remaps to '{variant_obj.name}' (tol={tolerance})")
-    apply_color_remaps(base_obj, variant_obj, remap_list, tolerance)
+    remap_mat = apply_color_remaps(base_obj, variant_obj, remap_list, tolerance, engine,
+                                   lut_size=lut_size)
+    if remap_mat is None:
+        return None
 
+    register_variant(base_obj, variant_obj, remap_list, tolerance, engine, lut_size)
     print("✅ Multi-remap applied successfully.")
+    return remap_mat
+
+
+def apply_multi_remap_batch(base_obj, variant_objs, remap_lists, tolerance=0.08,
+                            processes=None):
+    """
+    Bake one colorway per variant of `base_obj` in a process pool (see
+    color_remap.apply_color_remap_batch) and register each baked variant
+    with the 'BAKE' engine, like apply_multi_remap() does.
+
+    Returns:
+        list[Material]: The remap materials in `variant_objs` order (None
+        where a colorway failed).
+    """
+    materials = apply_color_remap_batch(base_obj, variant_objs, remap_lists, tolerance,
+                                        processes=processes)
+    for variant_obj, remap_list, mat in zip(variant_objs, remap_lists, materials):
+        if mat is not None:
+            register_variant(base_obj, variant_obj, remap_list, tolerance, 'BAKE')
+    return materials
+
+
+# -----------------------------------------------------
+# VARIANT REGISTRY
+# -----------------------------------------------------
+
+def register_variant(base_obj, variant_obj, remap_list, tolerance, engine, lut_size=33):
+    """Link `variant_obj` to `base_obj` and store how it was made (see variant_registry.py)."""
+    link_variant(base_obj, variant_obj)
+    store_remaps(variant_obj, remap_list, tolerance, engine, lut_size)
+
+
+def regenerate_registered_variants(objects=None, only_dirty=False):
+    """
+    Re-apply the stored remaps of every registered variant among `objects`
+    (default: all), e.g. after the base texture was repainted. With
+    `only_dirty`, only variants flagged out of date are re-applied.
+
+    'BAKE' variants sharing a base and tolerance are baked together in one
+    process pool (see apply_multi_remap_batch); the rest one at a time.
+
+    Returns:
+        tuple: (regenerated, failed) lists of variant names.
+    """
+    regenerated, failed = [], []
+    batches = {}
+    for variant_obj, base_obj, settings in list(registered_variants(objects, only_dirty)):
+        if settings["engine"] == 'BAKE' and settings["remap_list"]:
+            batches.setdefault((base_obj, settings["tolerance"]), []).append(
+                (variant_obj, settings["remap_list"]))
+            continue
+        if apply_multi_remap(base_obj, variant_obj, **settings) is None:
+            failed.append(variant_obj.name)
+        else:
+            regenerated.append(variant_obj.name)
+
+    for (base_obj, tolerance), entries in batches.items():
+        variant_objs = [variant_obj for variant_obj, _ in entries]
+        materials = apply_multi_remap_batch(
+            base_obj, variant_objs, [remap_list for _, remap_list in entries], tolerance)
+        materials += [None] * (len(variant_objs) - len(materials))  # batch failed outright
+        for variant_obj, mat in zip(variant_objs, materials):
+            (regenerated if mat is not None else failed).append(variant_obj.name)
+
+    print(f"🔁 Regenerated {len(regenerated)} variants ({len(failed)} failed)")
+    return regenerated, failed
 
 
 # Optional test
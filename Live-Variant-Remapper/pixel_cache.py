@@ -0,0 +1,98 @@
+"""
+pixel_cache.py
+
+Least-recently-used cache of base texture pixels, so applying remaps to the
+same base again skips reading the whole image back from Blender.
+
+Entries are stored per image name together with a fingerprint of the image's
+content; a lookup with a different fingerprint drops the stale entry. Once
+the cached arrays exceed the byte budget, the least recently used ones are
+evicted. Like pixel_remap.py, this module does not import bpy (remap_bake.py
+computes the fingerprints).
+
+Usage example:
+
+    import pixel_cache as pc
+    cache = pc.PixelCache(budget=512 * 2**20)
+    pixels = cache.get("Cube_BaseTex", fingerprint)
+    if pixels is None:
+        pixels = cache.put("Cube_BaseTex", fingerprint, read_pixels())
+"""
+
+from collections import OrderedDict
+
+
+class PixelCache:
+    """
+    LRU cache of read-only pixel arrays within a byte budget.
+
+    Attributes:
+        nbytes (int): Total size of the cached arrays.
+        hits (int): Lookups answered from the cache.
+        misses (int): Lookups that had to read the image.
+    """
+
+    def __init__(self, budget):
+        self._entries = OrderedDict()  # name → (fingerprint, pixels)
+        self._budget = budget
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def budget(self):
+        """Byte budget; 0 disables caching."""
+        return self._budget
+
+    @budget.setter
+    def budget(self, budget):
+        self._budget = budget
+        self._evict()
+
+    def get(self, name, fingerprint):
+        """Return the cached pixels for `name` if `fingerprint` still matches, else None."""
+        entry = self._entries.get(name)
+        if entry is None or entry[0] != fingerprint:
+            self.discard(name)
+            self.misses += 1
+            return None
+        self._entries.move_to_end(name)
+        self.hits += 1
+        return entry[1]
+
+    def put(self, name, fingerprint, pixels):
+        """
+        Cache `pixels` for `name`, marking the array read-only.
+        Arrays larger than the whole budget are not cached.
+
+        Returns:
+            ndarray: `pixels`.
+        """
+        self.discard(name)
+        if pixels.nbytes > self._budget:
+            return pixels
+
+        pixels.flags.writeable = False
+        self._entries[name] = (fingerprint, pixels)
+        self.nbytes += pixels.nbytes
+        self._evict()
+        return pixels
+
+    def discard(self, name):
+        """Drop the entry for `name`, if any."""
+        entry = self._entries.pop(name, None)
+        if entry is not None:
+            self.nbytes -= entry[1].nbytes
+
+    def clear(self):
+        """Drop every entry."""
+        self._entries.clear()
+        self.nbytes = 0
+
+    def _evict(self):
+        while self.nbytes > self._budget and self._entries:
+            _, (_, pixels) = self._entries.popitem(last=False)
+            self.nbytes -= pixels.nbytes
+
+    def __len__(self):
+        return len(self._entries)
@@ -0,0 +1,379 @@
+"""
+pixel_remap.py
+
+NumPy implementation of the color remap chain built by color_remap.py, used to
+bake remapped colors into pixels instead of evaluating nodes at render time.
+
+Each remap pair is applied in order, exactly like one stage of the node chain:
+
+    fac   = clamp(1 - distance(color.rgb, source.rgb) / tolerance, 0, 1)
+    color = mix(color, target, fac)
+
+Alpha is carried through untouched. This module does not import bpy, so it can
+be used (and benchmarked) outside Blender.
+
+Usage example:
+
+    import numpy as np
+    import pixel_remap as pr
+
+    pixels = np.random.rand(1024 * 1024, 4).astype(np.float32)
+    pr.remap_pixels(pixels, [
+        ((1.0, 0.8, 0.0, 1.0), (0.0, 0.2, 1.0, 1.0)),  # Yellow → Blue
+    ], tolerance=0.1)
+"""
+
+import multiprocessing
+import os
+import queue
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from multiprocessing import shared_memory
+
+import numpy as np
+
+
+def srgb_to_linear(rgb):
+    """Convert sRGB-encoded values to scene linear, in place."""
+    low = rgb <= 0.04045
+    high = np.power((rgb + 0.055) / 1.055, 2.4, dtype=np.float32)
+    np.divide(rgb, 12.92, out=rgb, where=low)
+    np.copyto(rgb, high, where=~low)
+    return rgb
+
+
+def linear_to_srgb(rgb):
+    """Convert scene linear values to sRGB encoding, in place."""
+    np.clip(rgb, 0.0, None, out=rgb)
+    low = rgb <= 0.0031308
+    high = np.power(rgb, 1.0 / 2.4, dtype=np.float32) * 1.055 - 0.055
+    np.multiply(rgb, 12.92, out=rgb, where=low)
+    np.copyto(rgb, high, where=~low)
+    return rgb
+
+
+def allocate_scratch(count):
+    """Preallocate the (diff, fac) buffers remap_pixels needs for `count` pixels."""
+    return np.empty((count, 3), dtype=np.float32), np.empty(count, dtype=np.float32)
+
+
+def remap_pixels(pixels, remap_pairs, tolerance=0.1, scratch=None):
+    """
+    Apply every remap pair to an (N, 4) float32 RGBA array, in place.
+
+    Args:
+        pixels (ndarray): (N, 4) float32 scene-linear RGBA pixels.
+        remap_pairs (list[tuple]): List of ((R,G,B,A), (R,G,B,A)) pairs.
+        tolerance (float): Color distance threshold, as in the node chain.
+        scratch (tuple): Optional buffers from allocate_scratch() with room
+            for at least N pixels, reused instead of allocating per call.
+
+    Returns:
+        ndarray: The same `pixels` array, remapped.
+    """
+    rgb = pixels[:, :3]
+    inv_tol = 1.0 / max(tolerance, 1e-5)
+
+    # Scratch buffers shared by all stages
+    if scratch is None:
+        scratch = allocate_scratch(len(rgb))
+    diff = scratch[0][:len(rgb)]
+    fac = scratch[1][:len(rgb)]
+
+    for source_color, target_color in remap_pairs:
+        src = np.asarray(source_color[:3], dtype=np.float32)
+        tgt = np.asarray(target_color[:3], dtype=np.float32)
+
+        # fac = clamp(1 - |color - src| / tol, 0, 1)
+        np.subtract(rgb, src, out=diff)
+        np.multiply(diff, diff, out=diff)
+        np.sum(diff, axis=1, out=fac)
+        np.sqrt(fac, out=fac)
+        fac *= -inv_tol
+        fac += 1.0
+        np.clip(fac, 0.0, 1.0, out=fac)
+
+        # color = color + fac * (tgt - color)
+        np.subtract(tgt, rgb, out=diff)
+        diff *= fac[:, None]
+        rgb += diff
+
+    return pixels
+
+
+# -----------------------------------------------------
+# UNIQUE-COLOR FAST PATH
+# -----------------------------------------------------
+
+def color_keys(pixels):
+    """
+    Pack 8-bit-exact (N, 4) RGBA floats into one uint32 key per pixel.
+
+    Only valid for pixels read from 8-bit images, whose values are k / 255.
+    """
+    quantized = np.empty(pixels.shape, dtype=np.uint8)
+    np.rint(pixels * 255.0, out=quantized, casting='unsafe')
+    return quantized.view(np.uint32).ravel()
+
+
+def has_few_colors(keys, sample_size=65536, max_ratio=0.25):
+    """
+    Cheaply guess whether remapping distinct colors beats remapping every
+    pixel, by counting distinct keys in an evenly strided sample.
+    """
+    step = max(1, len(keys) // sample_size)
+    sample = keys[::step]
+    return len(np.unique(sample)) <= max_ratio * len(sample)
+
+
+def unique_colors(pixels, keys=None):
+    """
+    Collapse 8-bit-exact (N, 4) RGBA pixels to their distinct colors.
+
+    Returns:
+        tuple: (colors, inverse) with `pixels == colors[inverse]`.
+    """
+    if keys is None:
+        keys = color_keys(pixels)
+    _, first, inverse = np.unique(keys, return_index=True, return_inverse=True)
+    return pixels[first], inverse.ravel()
+
+
+# -----------------------------------------------------
+# BANDED / THREADED PROCESSING
+# -----------------------------------------------------
+
+def resolve_threads(threads):
+    """Thread count to use; 0 or None means one per CPU core."""
+    return max(1, threads or os.cpu_count() or 1)
+
+
+def remap_band(band, srgb, dedupe, remap):
+    """
+    Remap one (n, 4) band of raw image pixels in place.
+
+    Args:
+        band (ndarray): Raw pixels as stored in the image.
+        srgb (bool): Pixels are sRGB-encoded; remap in scene linear.
+        dedupe (bool): Pixels are 8-bit exact; remap distinct colors only
+            when the band has few of them.
+        remap (callable): remap(colors) applying the remap in place.
+
+    Returns:
+        bool: True if the distinct-color path was used.
+    """
+    colors, inverse = band, None
+    if dedupe:
+        # Key before linearizing, while values are still exact k / 255
+        keys = color_keys(band)
+        if has_few_colors(keys):
+            colors, inverse = unique_colors(band, keys)
+        del keys
+
+    if srgb:
+        srgb_to_linear(colors[:, :3])
+    remap(colors)
+    if srgb:
+        linear_to_srgb(colors[:, :3])
+        np.clip(colors, 0.0, 1.0, out=colors)
+
+    if inverse is not None:
+        np.take(colors, inverse, axis=0, out=band)
+    return inverse is not None
+
+
+def process_bands(pixels, band_size, work, threads=1):
+    """
+    Run `work(band, start, stop, scratch)` over consecutive bands of `pixels`.
+
+    Bands are disjoint views of `pixels`, so with `threads` > 1 they can be
+    processed on a thread pool (NumPy releases the GIL on large array
+    operations) and results land directly in the shared buffer. Each worker
+    borrows its own scratch buffers from allocate_scratch(band_size).
+
+    Returns:
+        list: The return values of `work`, in band order.
+    """
+    starts = range(0, len(pixels), band_size)
+    workers = min(resolve_threads(threads), len(starts))
+
+    scratch_pool = queue.SimpleQueue()
+    for _ in range(workers):
+        scratch_pool.put(allocate_scratch(band_size))
+
+    def run(start):
+        stop = min(start + band_size, len(pixels))
+        scratch = scratch_pool.get()
+        try:
+            return work(pixels[start:stop], start, stop, scratch)
+        finally:
+            scratch_pool.put(scratch)
+
+    if workers <= 1:
+        return [run(start) for start in starts]
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(run, starts))
+
+
+def benchmark_threads(size=2048, pair_count=20, band_rows=64, max_threads=None, repeat=3):
+    """
+    Time a banded bake of a random size × size float image at 1, 2, 4 …
+    `max_threads` threads and print the scaling.
+
+    Returns:
+        list[tuple]: (threads, best seconds, speedup vs. 1 thread).
+    """
+    rng = np.random.default_rng(0)
+    source = rng.random((size * size, 4), dtype=np.float32)
+    pairs = [(tuple(rng.random(4)), tuple(rng.random(4))) for _ in range(pair_count)]
+    band_size = band_rows * size
+
+    def work(band, start, stop, scratch):
+        remap_pixels(band, pairs, 0.1, scratch)
+
+    max_threads = resolve_threads(max_threads)
+    counts = sorted({1, max_threads} | {2 ** i for i in range(1, 16) if 2 ** i < max_threads})
+
+    results = []
+    for threads in counts:
+        best = float("inf")
+        for _ in range(repeat):
+            pixels = source.copy()
+            started = time.perf_counter()
+            process_bands(pixels, band_size, work, threads)
+            best = min(best, time.perf_counter() - started)
+        results.append((threads, best, results[0][1] / best if results else 1.0))
+        print(f"{threads:>3} threads: {best:.3f}s  ×{results[-1][2]:.2f}")
+    return results
+
+
+# -----------------------------------------------------
+# PROCESS POOL BATCHES
+# -----------------------------------------------------
+
+def _remap_shared(src_name, out_name, shape, remap_pairs, tolerance, srgb, dedupe, band_size):
+    """Pool worker: remap the shared base pixels into a shared output block."""
+    src_shm = shared_memory.SharedMemory(name=src_name)
+    out_shm = shared_memory.SharedMemory(name=out_name)
+    try:
+        base = np.ndarray(shape, dtype=np.float32, buffer=src_shm.buf)
+        out = np.ndarray(shape, dtype=np.float32, buffer=out_shm.buf)
+        np.copyto(out, base)
+
+        def work(band, start, stop, scratch):
+            return remap_band(band, srgb, dedupe,
+                              lambda colors: remap_pixels(colors, remap_pairs, tolerance, scratch))
+
+        process_bands(out, band_size, work)
+        del base, out
+    finally:
+        src_shm.close()
+        out_shm.close()
+
+
+def _release(shm):
+    """Unlink and close a shared block, even if a caller still holds a view."""
+    shm.unlink()
+    try:
+        shm.close()
+    except BufferError:
+        pass  # the mapping goes away with the caller's last view
+
+
+def remap_variants(pixels, remap_lists, tolerance=0.1, srgb=False, dedupe=False,
+                   band_size=None, processes=None):
+    """
+    Remap a copy of `pixels` once per remap list, in a pool of processes.
+
+    The base pixels are copied once into shared memory that every worker
+    maps, and each worker writes its result into its own shared block, so
+    no pixel array is pickled. Workers are spawned (forking a running
+    Blender is not safe) and import this module, so it must stay free of
+    bpy. At most `processes` results exist at a time.
+
+    Args:
+        pixels (ndarray): (N, 4) float32 raw image pixels.
+        remap_lists (list[list]): One list of remap pairs per variant.
+        tolerance (float): Color distance threshold.
+        srgb, dedupe (bool): As in remap_band().
+        band_size (int): Pixels per band inside each worker.
+        processes (int): Worker processes; 0 or None means one per core.
+
+    Yields:
+        tuple: (index, remapped) in completion order. `remapped` is a view
+        of a shared block that is released when the generator advances, so
+        copy it or write it out first.
+    """
+    processes = resolve_threads(processes)
+    band_size = band_size or len(pixels)
+    shape = pixels.shape
+    todo = iter(enumerate(remap_lists))
+    pending = {}
+
+    src_shm = shared_memory.SharedMemory(create=True, size=max(pixels.nbytes, 1))
+    try:
+        np.copyto(np.ndarray(shape, dtype=np.float32, buffer=src_shm.buf), pixels)
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=processes, mp_context=context) as pool:
+
+            def submit():
+                while len(pending) < processes:
+                    index, remap_pairs = next(todo, (None, None))
+                    if index is None:
+                        return
+                    out_shm = shared_memory.SharedMemory(create=True, size=max(pixels.nbytes, 1))
+                    future = pool.submit(_remap_shared, src_shm.name, out_shm.name, shape,
+                                         remap_pairs, tolerance, srgb, dedupe, band_size)
+                    pending[future] = (index, out_shm)
+
+            submit()
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    index, out_shm = pending.pop(future)
+                    try:
+                        future.result()
+                        yield index, np.ndarray(shape, dtype=np.float32, buffer=out_shm.buf)
+                    finally:
+                        _release(out_shm)
+                submit()
+    finally:
+        for _, out_shm in pending.values():
+            _release(out_shm)
+        _release(src_shm)
+
+
+def benchmark_processes(size=1024, variants=8, pair_count=20, max_processes=None):
+    """
+    Time remap_variants() for `variants` remap lists of a random
+    size × size float image at 1, 2, 4 … `max_processes` processes.
+
+    Returns:
+        list[tuple]: (processes, seconds, speedup vs. 1 process).
+    """
+    rng = np.random.default_rng(0)
+    pixels = rng.random((size * size, 4), dtype=np.float32)
+    remap_lists = [
+        [(tuple(rng.random(4)), tuple(rng.random(4))) for _ in range(pair_count)]
+        for _ in range(variants)
+    ]
+
+    max_processes = resolve_threads(max_processes)
+    counts = sorted({1, max_processes} | {2 ** i for i in range(1, 16) if 2 ** i < max_processes})
+
+    results = []
+    for processes in counts:
+        started = time.perf_counter()
+        for _ in remap_variants(pixels, remap_lists, 0.1, band_size=64 * size,
+                                processes=processes):
+            pass
+        seconds = time.perf_counter() - started
+        results.append((processes, seconds, results[0][1] / seconds if results else 1.0))
+        print(f"{processes:>3} processes: {seconds:.3f}s  ×{results[-1][2]:.2f}")
+    return results
+
+
+# Optional benchmark
+if __name__ == "__main__":
+    benchmark_threads()
+    benchmark_processes()
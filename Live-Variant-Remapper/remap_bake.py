@@ -0,0 +1,744 @@
+"""
+remap_bake.py
+
+Bakes color remaps into a new image with NumPy, so the variant material can be
+a plain texture → BSDF setup whose shading cost does not grow with the number
+of remap pairs.
+
+Usage example:
+
+    import remap_bake as rb
+    img = rb.bake_remapped_image(
+        src_img=bpy.data.images["Cube_BaseTex"],
+        remap_pairs=[
+            ((1.0, 0.8, 0.0, 1.0), (0.0, 0.2, 1.0, 1.0)),  # Yellow → Blue
+        ],
+        tolerance=0.1,
+        name="Cube_Variant_RemapTex",
+    )
+"""
+
+import os
+import queue
+import threading
+import time
+import tracemalloc
+import zlib
+
+import bpy
+import numpy as np
+
+from pixel_remap import (
+    remap_pixels, remap_band, process_bands, remap_variants, resolve_threads, srgb_to_linear,
+)
+from remap_lut import apply_lut
+from pixel_cache import PixelCache
+from label_map import (
+    LabelMap, compute_label_map, recolor_pixels, encode_label_pixels, build_palette,
+    source_key, label_dtype,
+)
+
+
+# (fingerprint, label map) per source image name, recomputed when the image
+# content, source colors or tolerance change
+_label_maps = {}
+
+# Band size limits for baking, set from the add-on preferences (see ui.py)
+bake_settings = {
+    "tile_rows": 256,
+    "memory_budget": 256 * 2**20,
+    "threads": 0,  # 0 = one per CPU core
+}
+
+# Base texture pixels, reused while the image is unchanged (see base_pixels)
+pixel_cache = PixelCache(budget=512 * 2**20)
+
+# Upper bound on temporary bytes per pixel while its band is processed
+SCRATCH_BYTES_PER_PIXEL = 96
+
+# Timing and peak memory of the most recent bake (only `cached` and
+# `seconds` when it was loaded from the bake cache; see color_remap.py)
+last_bake_stats = {}
+
+
+# -----------------------------------------------------
+# PIXEL I/O
+# -----------------------------------------------------
+
+def is_srgb_encoded(image):
+    """True if the image's pixels are stored sRGB-encoded rather than linear."""
+    return not image.is_float and image.colorspace_settings.name == 'sRGB'
+
+
+def image_fingerprint(image):
+    """
+    Cheap stand-in for a hash of an image's pixels, built from metadata only
+    (hashing the pixels would cost as much as reading them).
+
+    Returns:
+        tuple: The fingerprint, or None when the pixels may differ from the
+        image's saved source (unsaved paint strokes, missing file).
+    """
+    if image.is_dirty:
+        return None
+
+    fingerprint = (tuple(image.size), image.channels, image.is_float,
+                   image.colorspace_settings.name, image.source)
+    if image.packed_file:
+        return fingerprint + (zlib.crc32(image.packed_file.data),)
+    if image.source == 'GENERATED':
+        return fingerprint + (image.generated_type, tuple(image.generated_color))
+    if image.source == 'FILE':
+        try:
+            stat = os.stat(bpy.path.abspath(image.filepath, library=image.library))
+        except OSError:
+            return None
+        return fingerprint + (image.filepath, stat.st_size, stat.st_mtime_ns)
+    return None
+
+
+def base_pixels(image):
+    """
+    Return an image's (N, 4) float32 RGBA pixels through `pixel_cache`,
+    reading them from Blender only on a miss.
+
+    Cached arrays are shared and read-only; use read_image_pixels() for a
+    copy that can be remapped in place.
+    """
+    fingerprint = image_fingerprint(image)
+    if fingerprint is None:
+        pixel_cache.discard(image.name)
+        return _read_pixels(image)
+
+    pixels = pixel_cache.get(image.name, fingerprint)
+    if pixels is None:
+        pixels = pixel_cache.put(image.name, fingerprint, _read_pixels(image))
+    return pixels
+
+
+def read_image_pixels(image):
+    """Return a writable (N, 4) float32 RGBA copy of an image's pixels."""
+    pixels = base_pixels(image)
+    return pixels if pixels.flags.writeable else pixels.copy()
+
+
+def _read_pixels(image):
+    """
+    Read an image's pixels into an (N, 4) float32 RGBA array.
+
+    Images with fewer than 4 channels are expanded to RGBA with opaque alpha.
+    """
+    width, height = image.size
+    channels = image.channels
+    flat = np.empty(width * height * channels, dtype=np.float32)
+    image.pixels.foreach_get(flat)
+    if channels == 4:
+        return flat.reshape(-1, 4)
+
+    src = flat.reshape(-1, channels)
+    rgba = np.ones((width * height, 4), dtype=np.float32)
+    if channels < 3:
+        rgba[:, :3] = src[:, :1]
+    else:
+        rgba[:, :3] = src[:, :3]
+    if channels == 2:
+        rgba[:, 3] = src[:, 1]
+    return rgba
+
+
+def read_linear_pixels(image):
+    """Read an image's pixels as (N, 4) float32 scene-linear RGBA."""
+    pixels = read_image_pixels(image)
+    if is_srgb_encoded(image):
+        srgb_to_linear(pixels[:, :3])
+    return pixels
+
+
+def write_image_pixels(image, pixels):
+    """Write an (N, 4) float32 RGBA array into a 4-channel image."""
+    image.pixels.foreach_set(pixels.ravel())
+    image.update()
+
+
+def save_pixels(pixels, like_image, filepath):
+    """
+    Write (N, 4) float32 RGBA pixels shaped like `like_image` to an image
+    file: OpenEXR for float images, else PNG. Goes through a temporary
+    image, so no datablock is left pointing at `filepath`.
+    """
+    width, height = like_image.size
+    tmp = bpy.data.images.new("LV Save", width=width, height=height, alpha=True,
+                              float_buffer=like_image.is_float)
+    try:
+        tmp.colorspace_settings.name = like_image.colorspace_settings.name
+        write_image_pixels(tmp, pixels)
+        tmp.filepath_raw = filepath
+        tmp.file_format = 'OPEN_EXR' if like_image.is_float else 'PNG'
+        tmp.save()
+    finally:
+        bpy.data.images.remove(tmp)
+
+
+def _save_copy(pixels, like_image, filepath):
+    """
+    save_pixels() for optional copies (e.g. bake cache entries): a failure
+    is logged and any partial file removed instead of failing the bake.
+
+    Returns:
+        bool: True if the file was written.
+    """
+    try:
+        save_pixels(pixels, like_image, filepath)
+        return True
+    except (OSError, RuntimeError) as e:
+        print(f"⚠️ Could not write '{filepath}': {e}")
+        try:
+            os.remove(filepath)
+        except OSError:
+            pass
+        return False
+
+
+def ensure_output_image(name, like_image):
+    """
+    Return an image called `name` matching `like_image`'s size and format,
+    reusing the existing datablock when possible.
+    """
+    width, height = like_image.size
+    img = bpy.data.images.get(name)
+    if img and img.is_float != like_image.is_float:
+        bpy.data.images.remove(img)
+        img = None
+
+    if img is None:
+        img = bpy.data.images.new(
+            name, width=width, height=height, alpha=True,
+            float_buffer=like_image.is_float,
+        )
+    elif tuple(img.size) != (width, height):
+        img.scale(width, height)
+
+    img.colorspace_settings.name = like_image.colorspace_settings.name
+    return img
+
+
+# -----------------------------------------------------
+# LABEL MAP CACHE
+# -----------------------------------------------------
+
+def cached_label_map(src_img, sources, tolerance):
+    """
+    Return the cached label map for `src_img` if it is still valid, else
+    None. Entries are keyed on the image's content fingerprint (see
+    image_fingerprint), so repainting or reloading the base invalidates them.
+    """
+    fingerprint = image_fingerprint(src_img)
+    entry = _label_maps.get(src_img.name)
+    if fingerprint is None or entry is None or entry[0] != fingerprint:
+        return None
+    label_map = entry[1]
+    if not label_map.matches(sources, tolerance):
+        return None
+    return label_map
+
+
+def store_label_map(src_img, label_map):
+    """
+    Cache `label_map` for `src_img`, replacing any previous one. Nothing is
+    cached while the image has unsaved changes (no fingerprint), since the
+    next paint stroke would silently invalidate it.
+    """
+    print(f"🏷️ Classified '{src_img.name}' against {len(label_map.sources)} source colors")
+    fingerprint = image_fingerprint(src_img)
+    if fingerprint is None:
+        _label_maps.pop(src_img.name, None)
+        return
+    _label_maps[src_img.name] = (fingerprint, label_map)
+
+
+def get_label_map(src_img, pixels, sources, tolerance):
+    """
+    Return the cached label map for `src_img`, computing it if the image
+    content, source colors or tolerance changed since it was built.
+
+    Args:
+        src_img (Image): Source texture the pixels were read from.
+        pixels (ndarray): (N, 4) scene-linear pixels of `src_img`.
+        sources (list[tuple]): Source colors of the remap list.
+        tolerance (float): Color distance threshold.
+    """
+    label_map = cached_label_map(src_img, sources, tolerance)
+    if label_map is None:
+        label_map = compute_label_map(pixels, sources, tolerance)
+        store_label_map(src_img, label_map)
+    return label_map
+
+
+def clear_label_maps():
+    """Drop every cached label map (e.g. after repainting a base texture)."""
+    _label_maps.clear()
+
+
+def clear_caches():
+    """Drop cached base pixels and label maps (called before a file loads)."""
+    pixel_cache.clear()
+    clear_label_maps()
+
+
+# -----------------------------------------------------
+# PALETTE IMAGES
+# -----------------------------------------------------
+
+def label_image_name(src_img, sources, tolerance):
+    """
+    Name of the label image for `src_img` classified against `sources` at
+    `tolerance`; variants of one base with the same sources share it.
+    """
+    key = zlib.crc32(repr((source_key(sources), round(tolerance, 6))).encode())
+    return f"{src_img.name}_LabelTex_{key:08x}"
+
+
+def label_image_matches(img, src_img, sources, tolerance):
+    """True if `img` holds the label map of `src_img`'s current content."""
+    fingerprint = image_fingerprint(src_img)
+    return (img is not None and fingerprint is not None
+            and tuple(img.size) == tuple(src_img.size)
+            and img.get("lv_sources") == str(source_key(sources))
+            and abs(img.get("lv_tolerance", -1.0) - tolerance) < 1e-6
+            and img.get("lv_base_fingerprint") == str(fingerprint))
+
+
+def ensure_label_image(src_img, sources, tolerance, name=None):
+    """
+    Return an 8-bit Non-Color image holding `src_img`'s label map (see
+    label_map.encode_label_pixels). It is only rewritten when the source
+    colors, tolerance or base image content change.
+
+    Args:
+        name (str): Image name (default: label_image_name(), shared by
+            every variant of the base with the same sources and tolerance).
+    """
+    width, height = src_img.size
+    name = name or label_image_name(src_img, sources, tolerance)
+    img = bpy.data.images.get(name)
+    if label_image_matches(img, src_img, sources, tolerance):
+        return img
+
+    if img and (img.is_float or tuple(img.size) != (width, height)):
+        bpy.data.images.remove(img)
+        img = None
+    if img is None:
+        img = bpy.data.images.new(name, width=width, height=height, alpha=True)
+    img.colorspace_settings.name = 'Non-Color'
+
+    pixels = read_linear_pixels(src_img)
+    label_map = get_label_map(src_img, pixels, sources, tolerance)
+    write_image_pixels(img, encode_label_pixels(label_map))
+    img.pack()
+
+    # An unsaved base has no fingerprint, so its label image is never reused
+    fingerprint = image_fingerprint(src_img)
+    img["lv_sources"] = str(source_key(sources))
+    img["lv_tolerance"] = tolerance
+    img["lv_base_fingerprint"] = str(fingerprint) if fingerprint is not None else ""
+    return img
+
+
+def write_palette_image(name, targets):
+    """
+    Write target colors into a 1 × (N + 1) float palette image, where pixel
+    i + 1 holds target i. Returns the image.
+    """
+    palette = build_palette(targets)
+    img = bpy.data.images.get(name)
+    if img and not img.is_float:
+        bpy.data.images.remove(img)
+        img = None
+    if img is None:
+        img = bpy.data.images.new(name, width=len(palette), height=1,
+                                  alpha=True, float_buffer=True)
+    elif tuple(img.size) != (len(palette), 1):
+        img.scale(len(palette), 1)
+
+    rgba = np.ones((len(palette), 4), dtype=np.float32)
+    rgba[:, :3] = palette
+    write_image_pixels(img, rgba)
+    img.pack()
+    return img
+
+
+# -----------------------------------------------------
+# BAKING
+# -----------------------------------------------------
+
+def configure(pixel_cache_budget=None, **settings):
+    """Update `bake_settings` and the pixel cache budget (called from the add-on preferences)."""
+    bake_settings.update(settings)
+    if pixel_cache_budget is not None:
+        pixel_cache.budget = pixel_cache_budget
+
+
+def band_rows(width, tile_rows=None, memory_budget=None, threads=1):
+    """
+    Number of image rows processed per band, so that the temporary buffers
+    of `threads` bands in flight stay within `memory_budget` bytes.
+    """
+    tile_rows = tile_rows or bake_settings["tile_rows"]
+    memory_budget = memory_budget or bake_settings["memory_budget"]
+    per_band = memory_budget // max(threads, 1)
+    rows_in_budget = per_band // (max(width, 1) * SCRATCH_BYTES_PER_PIXEL)
+    return int(max(1, min(tile_rows, rows_in_budget)))
+
+
+def _plan_bands(src_img, pixel_count, remap_pairs, tolerance, lut, lut_domain,
+                use_label_map):
+    """
+    Build the per-band remap for baking `src_img`, shared by
+    bake_remapped_image() and BakeJob.
+
+    Returns:
+        tuple: (work, new_labels) where `work(band, start, stop, scratch)` is
+        the process_bands() callback, and `new_labels` is the label map the
+        bands fill in (store it once every band is done) or None.
+    """
+    srgb = is_srgb_encoded(src_img)
+    sources = [source_color for source_color, _ in remap_pairs]
+    targets = [target_color for _, target_color in remap_pairs]
+    label_map = cached_label_map(src_img, sources, tolerance) if use_label_map else None
+    new_labels = None
+    if use_label_map and label_map is None:
+        new_labels = LabelMap(
+            np.zeros(pixel_count, dtype=label_dtype(len(sources))),
+            np.zeros(pixel_count, dtype=np.float16),
+            source_key(sources), tolerance,
+        )
+
+    def remap(colors, start, stop, scratch):
+        if lut is not None:
+            apply_lut(colors, lut, *lut_domain)
+        elif use_label_map:
+            if new_labels is not None:
+                band_map = compute_label_map(colors, sources, tolerance)
+                new_labels.labels[start:stop] = band_map.labels
+                new_labels.weights[start:stop] = band_map.weights
+            else:
+                band_map = label_map.band(start, stop)
+            recolor_pixels(colors, band_map, targets)
+        else:
+            remap_pixels(colors, remap_pairs, tolerance, scratch)
+
+    # Label-map bands must stay texel-aligned, so they are never deduplicated
+    dedupe = not src_img.is_float and not use_label_map
+
+    def work(band, start, stop, scratch):
+        return remap_band(band, srgb, dedupe,
+                          lambda colors: remap(colors, start, stop, scratch))
+
+    return work, new_labels
+
+
+def bake_remapped_image(src_img, remap_pairs, tolerance=0.1, name=None,
+                        lut=None, lut_domain=(0.0, 1.0), use_label_map=False,
+                        save_to=None):
+    """
+    Bake `remap_pairs` into a copy of `src_img`.
+
+    The remap runs in scene linear space, like the shader chain, so the result
+    matches what the node-based material renders. For 8-bit images with few
+    distinct colors (hand-painted / flat-shaded textures) only the distinct
+    colors are remapped and then scattered back to every pixel.
+
+    The image is read once into a float32 buffer and remapped in place, one
+    band of rows at a time (see `bake_settings`), so temporaries stay within
+    the memory budget even for 8K/16K textures. Bands run on a thread pool
+    and write straight into that shared buffer. Peak memory and timing of
+    the run are stored in `last_bake_stats`.
+
+    Args:
+        src_img (Image): Source texture found in the base material.
+        remap_pairs (list[tuple]): List of ((R,G,B,A), (R,G,B,A)) pairs.
+        tolerance (float): Color distance threshold (0.01–0.5).
+        name (str): Name of the output image (default: "<src>_Remap").
+        lut (ndarray): Optional compiled 3D LUT (see remap_lut.py). When
+            given it is applied instead of evaluating `remap_pairs`.
+        lut_domain (tuple): (min, max) input range covered by `lut`.
+        use_label_map (bool): Recolor through the cached per-texel label map
+            (see label_map.py), so changing only target colors skips the
+            distance math entirely.
+        save_to (str): Optional file path the result is also written to
+            (see bake_cache.py).
+
+    Returns:
+        Image: The baked image, packed into the .blend file.
+    """
+    width, height = src_img.size
+    if not width or not height:
+        print(f"❌ Image '{src_img.name}' has no pixel data.")
+        return None
+
+    started = time.perf_counter()
+    tracing = tracemalloc.is_tracing()
+    if not tracing:
+        tracemalloc.start()
+    tracemalloc.reset_peak()
+
+    try:
+        pixels = read_image_pixels(src_img)
+        threads = resolve_threads(bake_settings["threads"])
+        rows = band_rows(width, threads=threads)
+        band_size = rows * width
+
+        work, new_labels = _plan_bands(src_img, len(pixels), remap_pairs, tolerance,
+                                       lut, lut_domain, use_label_map)
+        deduped = sum(process_bands(pixels, band_size, work, threads))
+
+        if new_labels is not None:
+            store_label_map(src_img, new_labels)
+
+        out_img = ensure_output_image(name or f"{src_img.name}_Remap", src_img)
+        write_image_pixels(out_img, pixels)
+        if save_to:
+            _save_copy(pixels, src_img, save_to)
+        del pixels
+
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        if not tracing:
+            tracemalloc.stop()
+    out_img.pack()
+
+    bands = -(-width * height // band_size)
+    last_bake_stats.clear()
+    last_bake_stats.update(
+        image=out_img.name,
+        threads=threads,
+        seconds=time.perf_counter() - started,
+        peak_bytes=peak,
+        bands=bands,
+        band_rows=rows,
+        deduped_bands=deduped,
+    )
+
+    source = "LUT" if lut is not None else f"{len(remap_pairs)} color remaps"
+    print(f"🖼️ Baked {source} into '{out_img.name}' in {bands} bands of {rows} rows "
+          f"on {threads} threads "
+          f"({deduped} via distinct colors), peak {peak / 2**20:.1f} MiB, "
+          f"{last_bake_stats['seconds']:.2f}s")
+    return out_img
+
+
+def bake_variant_batch(src_img, remap_lists, tolerance=0.1, names=None, processes=None,
+                       save_to=None):
+    """
+    Bake one image per remap list from `src_img`, remapping in a pool of
+    worker processes that share the base pixels (see
+    pixel_remap.remap_variants). Blender only reads the base once and
+    creates the output images.
+
+    Args:
+        src_img (Image): Source texture found in the base material.
+        remap_lists (list[list]): One list of remap pairs per colorway.
+        tolerance (float): Color distance threshold (0.01–0.5).
+        names (list[str]): Output image names (default: "<src>_Remap<i>").
+        processes (int): Worker processes (default: the bake thread setting).
+        save_to (list[str]): Optional file path per colorway (or None) the
+            result is also written to (see bake_cache.py).
+
+    Returns:
+        list[Image]: The baked images in `remap_lists` order, packed into
+        the .blend file.
+    """
+    width, height = src_img.size
+    if not width or not height:
+        print(f"❌ Image '{src_img.name}' has no pixel data.")
+        return []
+
+    started = time.perf_counter()
+    names = names or [f"{src_img.name}_Remap{i}" for i in range(len(remap_lists))]
+    if processes is None:
+        processes = bake_settings["threads"]
+    processes = min(resolve_threads(processes), max(len(remap_lists), 1))
+    rows = band_rows(width)
+
+    pixels = base_pixels(src_img)
+    images = [None] * len(remap_lists)
+    for index, remapped in remap_variants(
+            pixels, remap_lists, tolerance,
+            srgb=is_srgb_encoded(src_img), dedupe=not src_img.is_float,
+            band_size=rows * width, processes=processes):
+        out_img = ensure_output_image(names[index], src_img)
+        write_image_pixels(out_img, remapped)
+        if save_to and save_to[index]:
+            _save_copy(remapped, src_img, save_to[index])
+        del remapped
+        out_img.pack()
+        images[index] = out_img
+    del pixels
+
+    seconds = time.perf_counter() - started
+    print(f"🖼️ Baked {len(images)} colorways of '{src_img.name}' on {processes} processes "
+          f"in {seconds:.2f}s")
+    return images
+
+
+# -----------------------------------------------------
+# BACKGROUND BAKING
+# -----------------------------------------------------
+
+class BakeJob:
+    """
+    A bake running on a worker thread, so the UI stays responsive.
+
+    The worker remaps a back buffer band by band. The main thread calls
+    poll() from a timer to copy finished bands into a front buffer and push
+    that into a preview image, so the image never shows a band halfway
+    through its remap. Only the main thread touches bpy.
+
+    Usage example:
+
+        job = rb.BakeJob(src_img, remap_pairs, 0.1, name="Cube_Variant_RemapTex").start()
+        # ... from a timer / modal operator:
+        if job.poll():
+            img = job.finish()
+    """
+
+    def __init__(self, src_img, remap_pairs, tolerance=0.1, name=None,
+                 lut=None, lut_domain=(0.0, 1.0), use_label_map=False):
+        width, _ = src_img.size
+        self.src_img = src_img
+        self.name = name or f"{src_img.name}_Remap"
+        self.source = "LUT" if lut is not None else f"{len(remap_pairs)} color remaps"
+
+        self.front = read_image_pixels(src_img)
+        self.back = self.front.copy()
+        self.image = ensure_output_image(f"{self.name}_Baking", src_img)
+        write_image_pixels(self.image, self.front)
+
+        self.threads = resolve_threads(bake_settings["threads"])
+        self.rows = band_rows(width, threads=self.threads)
+        self.band_size = self.rows * width
+        self.total = -(-len(self.front) // self.band_size)
+        self._work, self._new_labels = _plan_bands(
+            src_img, len(self.front), remap_pairs, tolerance,
+            lut, lut_domain, use_label_map,
+        )
+
+        self.swapped = 0
+        self.deduped = 0
+        self.error = None
+        self._finished_bands = queue.SimpleQueue()
+        self._cancelled = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._dirty = False
+        self._last_push = 0.0
+        self._started = 0.0
+
+        # Name of the material showing `image` while baking, if the caller
+        # made one (see color_remap.start_background_bake)
+        self.preview_material = None
+
+    def start(self):
+        """Start the worker thread. Returns the job."""
+        self._started = time.perf_counter()
+        self._thread.start()
+        return self
+
+    def _run(self):
+        def work(band, start, stop, scratch):
+            if self._cancelled.is_set():
+                return False
+            deduped = self._work(band, start, stop, scratch)
+            self._finished_bands.put((start, stop))
+            return deduped
+
+        try:
+            self.deduped = sum(process_bands(self.back, self.band_size, work, self.threads))
+        except Exception as e:  # surfaced on the main thread by finish()
+            self.error = e
+
+    @property
+    def progress(self):
+        """Fraction of bands swapped into the preview image so far."""
+        return self.swapped / self.total
+
+    def poll(self, push_interval=0.5):
+        """
+        Main thread: swap finished bands into the preview image, pushing
+        pixels to Blender at most every `push_interval` seconds.
+
+        Returns:
+            bool: True once the worker is done and every band is swapped in.
+        """
+        # Check before draining, so bands finished meanwhile are not missed
+        done = not self._thread.is_alive()
+
+        while True:
+            try:
+                start, stop = self._finished_bands.get_nowait()
+            except queue.Empty:
+                break
+            self.front[start:stop] = self.back[start:stop]
+            self.swapped += 1
+            self._dirty = True
+
+        now = time.perf_counter()
+        if self._dirty and (done or now - self._last_push >= push_interval):
+            write_image_pixels(self.image, self.front)
+            self._dirty = False
+            self._last_push = now
+        return done
+
+    def cancel(self):
+        """Main thread: stop the worker and discard the preview image."""
+        self._cancelled.set()
+        self._thread.join()
+
+        previous = bpy.data.images.get(self.name)
+        if previous:
+            self.image.user_remap(previous)
+        bpy.data.images.remove(self.image)
+        self.image = self.front = self.back = None
+        print(f"⏹️ Cancelled bake of '{self.name}'")
+
+    def finish(self):
+        """
+        Main thread: replace the output image with the finished preview
+        image. Call once poll() returns True.
+
+        Returns:
+            Image: The baked image, packed into the .blend file, or None if
+            the worker failed.
+        """
+        self._thread.join()
+        if self.error is not None:
+            print(f"❌ Bake of '{self.name}' failed: {self.error}")
+            bpy.data.images.remove(self.image)
+            self.image = self.front = self.back = None
+            return None
+
+        if self._new_labels is not None:
+            store_label_map(self.src_img, self._new_labels)
+
+        out_img = self.image
+        previous = bpy.data.images.get(self.name)
+        if previous and previous != out_img:
+            previous.user_remap(out_img)
+            bpy.data.images.remove(previous)
+        out_img.name = self.name
+        out_img.pack()
+        self.image = self.front = self.back = None
+
+        last_bake_stats.clear()
+        last_bake_stats.update(
+            image=out_img.name,
+            threads=self.threads,
+            seconds=time.perf_counter() - self._started,
+            peak_bytes=None,  # not traced: other Python code runs meanwhile
+            bands=self.total,
+            band_rows=self.rows,
+            deduped_bands=self.deduped,
+        )
+        print(f"🖼️ Baked {self.source} into '{out_img.name}' in the background, "
+              f"{self.total} bands of {self.rows} rows on {self.threads} threads, "
+              f"{last_bake_stats['seconds']:.2f}s")
+        return out_img
@@ -0,0 +1,144 @@
+"""
+remap_lut.py
+
+Compiles a remap list into a dense 3D color lookup table, so applying it costs
+the same no matter how many remap pairs it was built from, and reads/writes
+the table as a `.cube` file for reuse across sessions and tools.
+
+The table maps scene linear RGB in [0, 1] to remapped scene linear RGB and is
+sampled with trilinear interpolation. Because the remap falls off sharply at
+the tolerance edge, use a larger table (65³) for very small tolerances.
+Like pixel_remap.py, this module does not import bpy.
+
+Usage example:
+
+    import remap_lut as rl
+    lut = rl.build_lut(remap_pairs, tolerance=0.1, size=33)
+    rl.apply_lut(pixels, lut)
+    rl.write_cube("/tmp/variant.cube", lut, title="Cube_Variant")
+"""
+
+import numpy as np
+
+from pixel_remap import remap_pixels
+
+
+# -----------------------------------------------------
+# COMPILE / APPLY
+# -----------------------------------------------------
+
+def build_lut(remap_pairs, tolerance=0.1, size=33):
+    """
+    Evaluate the remap chain on a size³ RGB grid.
+
+    Returns:
+        ndarray: (size, size, size, 3) float32 table indexed [b, g, r],
+        the same order `.cube` files list their entries in.
+    """
+    axis = np.linspace(0.0, 1.0, size, dtype=np.float32)
+    b, g, r = np.meshgrid(axis, axis, axis, indexing='ij')
+    grid = np.empty((size ** 3, 4), dtype=np.float32)
+    grid[:, 0] = r.ravel()
+    grid[:, 1] = g.ravel()
+    grid[:, 2] = b.ravel()
+    grid[:, 3] = 1.0
+
+    remap_pixels(grid, remap_pairs, tolerance)
+    return np.ascontiguousarray(grid[:, :3]).reshape(size, size, size, 3)
+
+
+def apply_lut(pixels, lut, domain_min=0.0, domain_max=1.0):
+    """
+    Apply a 3D LUT to an (N, 4) float32 RGBA array, in place.
+
+    Colors outside the table's domain are clamped to it. Alpha is untouched.
+    """
+    size = lut.shape[0]
+    table = lut.reshape(-1, 3)
+    rgb = pixels[:, :3]
+
+    lo = np.asarray(domain_min, dtype=np.float32)
+    hi = np.asarray(domain_max, dtype=np.float32)
+    pos = np.clip(rgb, lo, hi)
+    pos -= lo
+    pos *= (size - 1) / (hi - lo)
+
+    idx = np.minimum(pos.astype(np.int32), size - 2)
+    pos -= idx
+    frac = pos
+
+    # Flat index of the lower corner, r fastest
+    base = idx[:, 0] + idx[:, 1] * size + idx[:, 2] * size * size
+
+    acc = np.zeros(rgb.shape, dtype=np.float32)
+    weight = np.empty(len(rgb), dtype=np.float32)
+    for dr in (0, 1):
+        for dg in (0, 1):
+            for db in (0, 1):
+                np.copyto(weight, frac[:, 0] if dr else 1.0 - frac[:, 0])
+                weight *= frac[:, 1] if dg else 1.0 - frac[:, 1]
+                weight *= frac[:, 2] if db else 1.0 - frac[:, 2]
+                offset = dr + dg * size + db * size * size
+                acc += table[base + offset] * weight[:, None]
+
+    rgb[...] = acc
+    return pixels
+
+
+# -----------------------------------------------------
+# .CUBE FILES
+# -----------------------------------------------------
+
+def write_cube(filepath, lut, title="Live Variant Remap"):
+    """Write a (size, size, size, 3) LUT as an Adobe/Resolve `.cube` file."""
+    size = lut.shape[0]
+    with open(filepath, "w", encoding="utf-8") as f:
+        f.write(f'TITLE "{title}"\n')
+        f.write("# Generated by Live Variant Color Remapper (scene linear)\n")
+        f.write(f"LUT_3D_SIZE {size}\n")
+        f.write("DOMAIN_MIN 0.0 0.0 0.0\n")
+        f.write("DOMAIN_MAX 1.0 1.0 1.0\n")
+        np.savetxt(f, lut.reshape(-1, 3), fmt="%.6f")
+    return filepath
+
+
+def read_cube(filepath):
+    """
+    Read a 3D `.cube` file.
+
+    Returns:
+        tuple: (lut, domain_min, domain_max) where `lut` is a
+        (size, size, size, 3) float32 array indexed [b, g, r].
+    """
+    size = None
+    domain_min = (0.0, 0.0, 0.0)
+    domain_max = (1.0, 1.0, 1.0)
+    rows = []
+
+    with open(filepath, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            key = line.split()[0]
+            if key == "LUT_3D_SIZE":
+                size = int(line.split()[1])
+            elif key == "LUT_1D_SIZE":
+                raise ValueError("1D .cube LUTs are not supported")
+            elif key == "DOMAIN_MIN":
+                domain_min = tuple(float(v) for v in line.split()[1:4])
+            elif key == "DOMAIN_MAX":
+                domain_max = tuple(float(v) for v in line.split()[1:4])
+            elif key == "LUT_3D_INPUT_RANGE":
+                lo, hi = (float(v) for v in line.split()[1:3])
+                domain_min, domain_max = (lo, lo, lo), (hi, hi, hi)
+            elif key == "TITLE":
+                continue
+            else:
+                rows.append(line.split()[:3])
+
+    if not size or len(rows) != size ** 3:
+        raise ValueError(f"'{filepath}' is not a valid 3D .cube file")
+
+    lut = np.asarray(rows, dtype=np.float32).reshape(size, size, size, 3)
+    return lut, domain_min, domain_max
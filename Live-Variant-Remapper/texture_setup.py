@@ -4,17 +4,24 @@ texture_setup.py
 Utility functions for:
 - Creating texture-paint-ready materials.
 - Generating and saving texture images.
-- Duplicating objects (with rig + modifiers) and spacing along the X-axis.
+- Duplicating objects (with rig + modifiers) and spacing along the X-axis,
+  optionally sharing the base mesh and overriding materials per object.
 
 Usage example (inside Blender Python console or another script):
 
     import texture_setup as tsu
     tsu.create_textured_duplicate_with_spacing()
+
+Everything works through the data API on explicitly passed objects,
+collections and scenes (falling back to the context only when they are
+omitted), so it also runs in background mode without operator overhead.
 """
 
 import bpy
 import os
 
+from variant_layout import DEFAULT_COLUMNS, variant_collection, place_variant
+
 
 # -----------------------------------------------------
 # IMAGE HANDLER
@@ -37,21 +44,108 @@ def save_image_to_temp(image, filename="BaseColor_Texture.png"):
 # MATERIAL CREATOR
 # -----------------------------------------------------
 
-def create_base_material_with_texture(obj, color=(0.8, 0.8, 0.8, 1.0)):
+# Material property holding the settings of a texture not allocated yet
+PENDING_TEXTURE = "lv_pending_texture"
+
+
+def find_base_material(obj):
     """
-    Create and assign a texture-paint-ready material to the given object.
+    Return the first material on `obj` with an Image Texture node that has
+    an image or a pending lazy texture, or None.
+    """
+    for mat in obj.data.materials:
+        if _base_texture_node(mat):
+            return mat
+    return None
+
+
+def _base_texture_node(mat):
+    """The Image Texture node holding `mat`'s base texture, or None."""
+    if not mat or not mat.use_nodes:
+        return None
+    tex_nodes = [n for n in mat.node_tree.nodes if n.type == 'TEX_IMAGE']
+    for node in tex_nodes:
+        if node.image:
+            return node
+    return tex_nodes[0] if tex_nodes and PENDING_TEXTURE in mat else None
+
+
+def create_base_material_with_texture(obj, color=(0.8, 0.8, 0.8, 1.0), scene=None,
+                                      enter_paint_mode=False, resolution=1024, lazy=False):
+    """
+    Make sure the object has a texture-paint-ready material, reusing an
+    existing image-textured one and only creating a new material if missing.
 
     Args:
         obj (Object): Blender object (must be of type 'MESH')
         color (tuple): RGBA tuple for the initial texture color
+        scene (Scene): Scene whose paint canvas is set (default: context scene)
+        enter_paint_mode (bool): Switch `obj` into Texture Paint mode
+            (needs an interactive context; off for scripts and batch runs)
+        resolution (int): Width and height of a newly created texture
+        lazy (bool): Don't allocate a new texture yet; ensure_base_texture()
+            creates it once painting starts (see ui.py) or a remap needs it
 
     Returns:
-        tuple: (Material, Image)
+        tuple: (Material, Image); Image is None while a lazy texture is pending
     """
     if not obj or obj.type != 'MESH':
         print("❌ Select a mesh object first.")
         return None, None
 
+    mat = find_base_material(obj)
+    if mat:
+        print(f"♻️ Reusing material '{mat.name}' on '{obj.name}'")
+    else:
+        mat = _create_base_material(obj)
+        mat[PENDING_TEXTURE] = {"color": list(color), "resolution": resolution}
+
+    img = None if lazy else ensure_base_texture(obj, scene)
+
+    if enter_paint_mode:
+        with bpy.context.temp_override(active_object=obj, object=obj):
+            bpy.ops.object.mode_set(mode='TEXTURE_PAINT')
+
+    return mat, img
+
+
+def ensure_base_texture(obj, scene=None):
+    """
+    Return the image of `obj`'s base material, allocating and saving a
+    pending lazy texture first, and make it the scene's paint canvas.
+
+    Returns:
+        Image: The base texture, or None if `obj` has no base material.
+    """
+    mat = find_base_material(obj) if obj and obj.type == 'MESH' else None
+    if not mat:
+        return None
+
+    tex_node = _base_texture_node(mat)
+    if tex_node.image is None:
+        pending = mat[PENDING_TEXTURE]
+        resolution = int(pending["resolution"])
+
+        # Create and save image
+        img_name = f"{obj.name}_BaseTex"
+        img = bpy.data.images.new(img_name, width=resolution, height=resolution, alpha=True)
+        img.generated_color = tuple(pending["color"])
+        save_image_to_temp(img, f"{img_name}.png")
+
+        # Attach image to texture node
+        tex_node.image = img
+        print(f"🖌️ Allocated {resolution}×{resolution} texture '{img.name}' for '{obj.name}'")
+    if PENDING_TEXTURE in mat:
+        del mat[PENDING_TEXTURE]
+
+    # Prepare for texture paint (data API only, no mode switching)
+    scene = scene or bpy.context.scene
+    scene.tool_settings.image_paint.canvas = tex_node.image
+    return tex_node.image
+
+
+def _create_base_material(obj):
+    """Create a texture → BSDF material (without image) and assign it to `obj`."""
     # Create new material with nodes
     mat = bpy.data.materials.new(name=f"{obj.name}_BaseMaterial")
     mat.use_nodes = True
@@ -75,74 +169,153 @@ def create_base_material_with_texture(obj, color=(0.8, 0.8, 0.8, 1.0)):
     links.new(tex_node.outputs["Color"], bsdf.inputs["Base Color"])
     links.new(bsdf.outputs["BSDF"], out.inputs["Surface"])
 
-    # Create and save image
-    img_name = f"{obj.name}_BaseTex"
-    img = bpy.data.images.new(img_name, width=1024, height=1024, alpha=True)
-    img.generated_color = color
-    save_image_to_temp(img, f"{img_name}.png")
-
-    # Attach image to texture node
-    tex_node.image = img
-
     # Assign material to object
     if not obj.data.materials:
         obj.data.materials.append(mat)
     else:
         obj.data.materials[0] = mat
 
-    # Prepare for texture paint
-    bpy.ops.object.mode_set(mode='TEXTURE_PAINT')
-    bpy.context.tool_settings.image_paint.canvas = img
-    bpy.ops.object.mode_set(mode='OBJECT')
-
     print(f"✅ Created material '{mat.name}' and assigned to '{obj.name}'")
-    return mat, img
+    return mat
 
 
 # -----------------------------------------------------
 # DUPLICATION HANDLER
 # -----------------------------------------------------
 
-def duplicate_with_rig_and_texture(base_obj):
+# Modifier type → identifiers of its writable RNA properties (see modifier_properties)
+_modifier_properties = {}
+
+
+def modifier_properties(mod):
+    """
+    Return the identifiers of the properties worth copying for `mod`'s type.
+
+    Built once per modifier type from `bl_rna.properties`: read-only
+    properties (including nested structs) and collections are left out.
+    """
+    props = _modifier_properties.get(mod.type)
+    if props is None:
+        props = tuple(
+            p.identifier for p in mod.bl_rna.properties
+            if p.identifier not in {"rna_type", "name", "type"}
+            and not p.is_readonly and p.type != 'COLLECTION'
+        )
+        _modifier_properties[mod.type] = props
+    return props
+
+
+def copy_modifiers(base_obj, variant_obj):
+    """
+    Recreate on `variant_obj` the modifiers of `base_obj` it is missing.
+
+    Object.copy() already clones the modifier stack, so this usually has
+    nothing to do; modifiers it did not carry over are added with their
+    settings copied.
+    """
+    existing = {mod.name for mod in variant_obj.modifiers}
+    for mod in base_obj.modifiers:
+        if mod.name in existing:
+            continue
+        try:
+            new_mod = variant_obj.modifiers.new(mod.name, mod.type)
+        except (RuntimeError, TypeError) as e:
+            print(f"⚠️ Could not copy modifier '{mod.name}': {e}")
+            continue
+        for attr in modifier_properties(mod):
+            try:
+                setattr(new_mod, attr, getattr(mod, attr))
+            except (AttributeError, TypeError, ValueError):
+                pass  # e.g. a target of the wrong type for this object
+
+
+def variant_materials(obj):
+    """Return the material each of `obj`'s slots shows (object-linked ones included)."""
+    return [slot.material for slot in obj.material_slots]
+
+
+def assign_variant_materials(obj, materials):
+    """
+    Make `obj` show `materials`, one per slot, if it doesn't already.
+
+    An object with its own mesh gets them on the mesh. An object sharing its
+    mesh (see duplicate_with_rig_and_texture) keeps the mesh's slots and
+    overrides them with object-linked materials, leaving the other users of
+    the mesh untouched; slots beyond `materials` show the last one. Adding a
+    slot would change every user of the mesh, so a shared mesh without slots
+    is left alone (duplicate_with_rig_and_texture never shares one).
+    """
+    shared = obj.data.users > 1 or any(slot.link == 'OBJECT' for slot in obj.material_slots)
+    if not shared:
+        if list(obj.data.materials) != list(materials):
+            obj.data.materials.clear()
+            for mat in materials:
+                obj.data.materials.append(mat)
+        return
+
+    if not obj.material_slots:
+        print(f"⚠️ '{obj.name}' shares a mesh without material slots; materials not assigned.")
+        return
+    for i, slot in enumerate(obj.material_slots):
+        mat = materials[min(i, len(materials) - 1)] if materials else None
+        if slot.link != 'OBJECT':
+            slot.link = 'OBJECT'
+        if slot.material != mat:
+            slot.material = mat
+
+
+def duplicate_with_rig_and_texture(base_obj, collection=None, share_mesh=False, offset=True):
     """
     Duplicate mesh object with rig (if any), modifiers, and textures intact.
+
+    Args:
+        base_obj (Object): Mesh object to duplicate.
+        collection (Collection): Where to link the duplicate (default: the
+            base object's first collection).
+        share_mesh (bool): Reuse the base's mesh datablock instead of copying
+            it; the variant's materials then go on object-linked slots (see
+            assign_variant_materials), so N variants cost one mesh.
+        offset (bool): Space base and duplicate apart along X (base to
+            -2, duplicate to +2); off when a layout places the variants
+            (see variant_layout.py).
+
     Returns the new duplicate object.
     """
     if not base_obj or base_obj.type != 'MESH':
         print("❌ Please select a valid mesh object.")
         return None
 
-    # Duplicate mesh object
+    # Object-linked materials need slots on the mesh, and adding one to a
+    # shared mesh would change the base too
+    if share_mesh and not base_obj.data.materials:
+        print(f"⚠️ '{base_obj.name}' has no material slots; copying its mesh instead of sharing it.")
+        share_mesh = False
+
+    # Duplicate mesh object (Object.copy() keeps pointing at the base mesh)
     variant_obj = base_obj.copy()
-    variant_obj.data = base_obj.data.copy()
-    bpy.context.collection.objects.link(variant_obj)
+    if not share_mesh:
+        variant_obj.data = base_obj.data.copy()
+    if collection is None:
+        collection = (base_obj.users_collection[0] if base_obj.users_collection
+                      else bpy.context.scene.collection)
+    collection.objects.link(variant_obj)
     variant_obj.name = f"{base_obj.name}_Variant"
 
     # Preserve rig/armature
     if base_obj.parent and base_obj.parent.type == 'ARMATURE':
         variant_obj.parent = base_obj.parent
-        # Copy modifiers
-        variant_obj.modifiers.clear()
-        for mod in base_obj.modifiers:
-            try:
-                new_mod = variant_obj.modifiers.new(mod.name, mod.type)
-                for attr in dir(mod):
-                    if not attr.startswith("_") and hasattr(new_mod, attr):
-                        try:
-                            setattr(new_mod, attr, getattr(mod, attr))
-                        except:
-                            pass
-            except Exception as e:
-                print(f"⚠️ Could not copy modifier '{mod.name}': {e}")
-
-    # Copy materials (linked)
-    variant_obj.data.materials.clear()
-    for mat in base_obj.data.materials:
-        variant_obj.data.materials.append(mat)
+        copy_modifiers(base_obj, variant_obj)
+
+    # Copy materials (linked); a shared mesh already has the base's
+    if not share_mesh:
+        variant_obj.data.materials.clear()
+        for mat in base_obj.data.materials:
+            variant_obj.data.materials.append(mat)
 
     # Offset positions for visibility
-    base_obj.location.x -= 2.0
-    variant_obj.location.x = base_obj.location.x + 4.0
+    if offset:
+        base_obj.location.x -= 2.0
+        variant_obj.location.x = base_obj.location.x + 4.0
 
     print(f"✅ Duplicated '{base_obj.name}' → '{variant_obj.name}' (rig + materials preserved)")
     return variant_obj
@@ -152,25 +325,42 @@ def duplicate_with_rig_and_texture(base_obj):
 # MAIN ENTRY
 # -----------------------------------------------------
 
-def create_textured_duplicate_with_spacing():
+def create_textured_duplicate_with_spacing(obj=None, collection=None, scene=None,
+                                           enter_paint_mode=False, resolution=1024, lazy=False,
+                                           share_mesh=False, layout=False, spacing=None,
+                                           columns=DEFAULT_COLUMNS):
     """
-    Creates base texture material, assigns it to the active object,
-    duplicates it with rig + materials intact, and positions:
+    Creates base texture material, assigns it to the object (default: the
+    active object), duplicates it with rig + materials intact, and positions:
         - original at X = -2
         - duplicate at X = +2
+
+    With `layout`, the base stays put and the duplicate goes into the base's
+    "<base>_Variants" collection, at the next slot of its grid (`spacing`,
+    `columns`; see variant_layout.py), so repeated calls don't overlap.
+
+    `collection` and `share_mesh` are passed on to
+    duplicate_with_rig_and_texture(), the other arguments to
+    create_base_material_with_texture().
     """
-    obj = bpy.context.active_object
+    obj = obj or bpy.context.active_object
     if not obj or obj.type != 'MESH':
         print("❌ Please select a mesh object first.")
         return None, None
 
     # Ensure base material exists
-    mat, img = create_base_material_with_texture(obj)
+    mat, img = create_base_material_with_texture(obj, scene=scene,
+                                                 enter_paint_mode=enter_paint_mode,
+                                                 resolution=resolution, lazy=lazy)
     if not mat:
         return None, None
 
     # Duplicate object with rig + texture
-    dup = duplicate_with_rig_and_texture(obj)
+    if layout:
+        dup = duplicate_with_rig_and_texture(obj, variant_collection(obj), share_mesh, offset=False)
+        place_variant(obj, dup, spacing, columns)
+    else:
+        dup = duplicate_with_rig_and_texture(obj, collection, share_mesh)
 
     print(f"✅ Ready: '{obj.name}' and '{dup.name}' are spaced and share materials.")
     return obj, dup
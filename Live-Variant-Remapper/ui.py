@@ -13,8 +13,54 @@ Integrates with:
 """
 
 import bpy
-from bpy.props import FloatVectorProperty, CollectionProperty, PointerProperty
-from bpy.types import PropertyGroup, Operator, Panel
+import time
+from bpy.app.handlers import persistent
+from bpy.props import (
+    FloatVectorProperty, CollectionProperty, PointerProperty, EnumProperty,
+    FloatProperty, IntProperty, StringProperty, BoolProperty,
+)
+from bpy.types import PropertyGroup, Operator, Panel, AddonPreferences
+from bpy_extras.io_utils import ExportHelper, ImportHelper
+
+
+# --------------------------------------------------------
+# Live preview: debounced value patches on the variant material
+# --------------------------------------------------------
+LIVE_PREVIEW_DELAY = 0.1  # seconds of quiet before edits are pushed
+
+_live_preview = {"scene": None, "base": None, "last_edit": 0.0}
+
+
+def _on_remap_edit(self, context):
+    """Property update callback: queue a live preview of the remap list."""
+    settings = context.scene.live_variant_settings
+    if not settings.live_preview or not context.active_object:
+        return
+
+    _live_preview["scene"] = context.scene.name
+    _live_preview["base"] = context.active_object.name
+    _live_preview["last_edit"] = time.monotonic()
+    if not bpy.app.timers.is_registered(_flush_live_preview):
+        bpy.app.timers.register(_flush_live_preview, first_interval=LIVE_PREVIEW_DELAY)
+
+
+def _flush_live_preview():
+    """Timer callback: push pending edits once the user pauses dragging."""
+    idle = time.monotonic() - _live_preview["last_edit"]
+    if idle < LIVE_PREVIEW_DELAY:
+        return LIVE_PREVIEW_DELAY - idle
+
+    from color_remap import update_remap_values
+
+    scene = bpy.data.scenes.get(_live_preview["scene"] or "")
+    base_obj = bpy.data.objects.get(_live_preview["base"] or "")
+    if scene and base_obj:
+        variant_obj = _find_variant(scene, base_obj)
+        settings = scene.live_variant_settings
+        remaps = [(tuple(e.source_color), tuple(e.target_color)) for e in settings.remap_list]
+        if variant_obj and remaps:
+            update_remap_values(variant_obj, remaps, settings.tolerance)
+    return None
 
 
 # --------------------------------------------------------
@@ -27,7 +73,8 @@ class LiveVariantColorMap(PropertyGroup):
         size=4,
         min=0.0,
         max=1.0,
-        default=(1.0, 1.0, 1.0, 1.0)
+        default=(1.0, 1.0, 1.0, 1.0),
+        update=_on_remap_edit
     )
 
     target_color: FloatVectorProperty(
@@ -36,7 +83,8 @@ class LiveVariantColorMap(PropertyGroup):
         size=4,
         min=0.0,
         max=1.0,
-        default=(1.0, 0.0, 0.0, 1.0)
+        default=(1.0, 0.0, 0.0, 1.0),
+        update=_on_remap_edit
     )
 
 
@@ -46,6 +94,187 @@ class LiveVariantColorMap(PropertyGroup):
 class LiveVariantSettings(PropertyGroup):
     remap_list: CollectionProperty(type=LiveVariantColorMap)
 
+    engine: EnumProperty(
+        name="Engine",
+        description="How the color remaps are applied to the variant",
+        items=(
+            ('NODES', "Shader Nodes", "Remap live in the variant material's node tree"),
+            ('BAKE', "Bake", "Bake the remapped colors into a new texture"),
+            ('LUT', "Bake (LUT)", "Compile the remaps into a 3D lookup table and bake through it"),
+            ('LABELS', "Bake (Cached Matches)",
+             "Classify texels once per set of source colors; target-only edits re-bake instantly"),
+            ('PALETTE', "Palette Shader",
+             "Small fixed shader reading a label map and a palette image; target edits only rewrite the palette"),
+            ('SHARED', "Shared Material",
+             "All variants of a base share one shader; each variant's colors live in its custom properties"),
+        ),
+        default='NODES'
+    )
+
+    tolerance: FloatProperty(
+        name="Tolerance",
+        description="Color distance within which a source color is remapped",
+        min=0.01,
+        max=0.5,
+        default=0.08,
+        update=_on_remap_edit
+    )
+
+    share_mesh: BoolProperty(
+        name="Share Mesh",
+        description="New variants reuse the base mesh and override its materials per object",
+        default=False
+    )
+
+    grid_layout: BoolProperty(
+        name="Grid Layout",
+        description="Keep the base in place and add each new variant to a grid in the base's Variants collection",
+        default=True
+    )
+
+    grid_spacing: FloatProperty(
+        name="Spacing",
+        description="Distance between variants in the grid (0 = from the base's size)",
+        min=0.0,
+        default=0.0,
+        subtype='DISTANCE'
+    )
+
+    grid_columns: IntProperty(
+        name="Columns",
+        description="Variants per grid row",
+        min=1,
+        max=256,
+        default=8
+    )
+
+    live_preview: BoolProperty(
+        name="Live Preview",
+        description="Push color edits straight into the variant's node or palette material",
+        default=True
+    )
+
+    lut_size: IntProperty(
+        name="LUT Size",
+        description="Lookup table resolution per axis (33 is usually enough, 65 for tight tolerances)",
+        min=9,
+        max=129,
+        default=33
+    )
+
+
+# Engines that bake pixels with remap_bake.bake_remapped_image
+BAKE_ENGINES = {'BAKE', 'LUT', 'LABELS'}
+
+
+def _get_prefs(context):
+    """Return this add-on's preferences, or None when run as a loose script."""
+    addon = context.preferences.addons.get(__package__ or "")
+    return addon.preferences if addon else None
+
+
+def _sync_bake_settings(context):
+    """Push the bake preferences into remap_bake / bake_cache before a bake."""
+    import remap_bake
+
+    import bake_cache
+
+    prefs = _get_prefs(context)
+    if prefs:
+        bake_cache.configure(
+            directory=prefs.bake_cache_dir,
+            max_bytes=prefs.bake_cache_mb * 2**20,
+        )
+        remap_bake.configure(
+            tile_rows=prefs.tile_rows,
+            memory_budget=prefs.memory_budget_mb * 2**20,
+            threads=prefs.bake_threads,
+            pixel_cache_budget=prefs.pixel_cache_mb * 2**20,
+        )
+
+
+def _bake_report(engine):
+    """One-line summary of the last bake for operator reports."""
+    import remap_bake
+
+    stats = remap_bake.last_bake_stats
+    if engine not in BAKE_ENGINES or not stats:
+        return ""
+    if stats.get("cached"):
+        return f" (loaded from the bake cache in {stats['seconds']:.2f}s)"
+    peak = f"peak {stats['peak_bytes'] / 2**20:.0f} MiB, " if stats["peak_bytes"] else ""
+    return (f" ({stats['bands']} bands on {stats['threads']} threads, "
+            f"{peak}{stats['seconds']:.2f}s)")
+
+
+@persistent
+def _clear_caches_on_load(*args):
+    """load_pre handler: cached pixels and label maps belong to the old file."""
+    import remap_bake
+    remap_bake.clear_caches()
+
+
+# Owner of the Object.mode msgbus subscription
+_mode_owner = object()
+
+# Name of the object being texture painted, if any
+_painting = {"object": None}
+
+
+def _on_mode_change():
+    """
+    msgbus callback: allocate a pending base texture once painting starts,
+    and flag the base's baked variants out of date once it ends.
+    """
+    from texture_setup import ensure_base_texture
+    from variant_registry import mark_dirty
+
+    obj = bpy.context.active_object
+    if obj is None:
+        return
+    if obj.mode == 'TEXTURE_PAINT':
+        ensure_base_texture(obj, bpy.context.scene)
+        _painting["object"] = obj.name
+    elif _painting["object"] == obj.name:
+        _painting["object"] = None
+        mark_dirty(obj)
+
+
+def _subscribe_mode_changes():
+    bpy.msgbus.subscribe_rna(
+        key=(bpy.types.Object, "mode"),
+        owner=_mode_owner,
+        args=(),
+        notify=_on_mode_change,
+    )
+
+
+@persistent
+def _resubscribe_on_load(*args):
+    """load_post handler: loading a file drops msgbus subscriptions."""
+    bpy.msgbus.clear_by_owner(_mode_owner)
+    _subscribe_mode_changes()
+
+
+def _find_variant(scene, base_obj):
+    """
+    Return the active variant of `base_obj` in `scene` from the variant
+    registry, or None.
+
+    Variants made before the registry existed are found once by their
+    "<base>_Variant" name and linked, so later lookups skip the scan.
+    """
+    from variant_registry import active_variant, link_variant
+
+    variant_obj = active_variant(base_obj)
+    if variant_obj is None:
+        for obj in scene.objects:
+            if obj.name.startswith(f"{base_obj.name}_Variant") and obj.live_variant.base is None:
+                link_variant(base_obj, obj)
+                return obj
+        return None
+    return variant_obj if scene.objects.get(variant_obj.name) else None
+
 
 # --------------------------------------------------------
 # 3️⃣ Operators
@@ -79,14 +308,56 @@ class LV_OT_CreateBaseAndVariant(Operator):
 
     def execute(self, context):
         from texture_setup import create_textured_duplicate_with_spacing
-        base_obj, variant_obj = create_textured_duplicate_with_spacing()
+        prefs = _get_prefs(context)
+        settings = context.scene.live_variant_settings
+        base_obj, variant_obj = create_textured_duplicate_with_spacing(
+            context.active_object, context.collection, context.scene,
+            resolution=int(prefs.texture_resolution) if prefs else 1024,
+            lazy=prefs.lazy_texture if prefs else False,
+            share_mesh=settings.share_mesh,
+            layout=settings.grid_layout,
+            spacing=settings.grid_spacing or None,
+            columns=settings.grid_columns,
+        )
         if not base_obj or not variant_obj:
             self.report({'ERROR'}, "Failed to create pair — check selection.")
             return {'CANCELLED'}
+
+        from variant_registry import link_variant
+        link_variant(base_obj, variant_obj)
         self.report({'INFO'}, f"Pair created: {base_obj.name}, {variant_obj.name}")
         return {'FINISHED'}
 
 
+class LV_OT_LayoutVariants(Operator):
+    """Re-arrange the base's Variants collection into a gap-free grid, oldest variant first"""
+    bl_idname = "livevariant.layout_variants"
+    bl_label = "Re-layout Variants"
+
+    def execute(self, context):
+        from variant_layout import variant_collection, layout_variants
+        from variant_registry import variants_of
+
+        base_obj = context.active_object
+        if not base_obj:
+            self.report({'ERROR'}, "Select the base mesh first.")
+            return {'CANCELLED'}
+
+        # Registered variants in creation order, then anything else in the collection
+        order = {obj: i for i, obj in enumerate(variants_of(base_obj))}
+        variants = sorted(variant_collection(base_obj).objects,
+                          key=lambda obj: order.get(obj, len(order)))
+        if not variants:
+            self.report({'ERROR'}, "No variants in this base's Variants collection.")
+            return {'CANCELLED'}
+
+        settings = context.scene.live_variant_settings
+        layout_variants(base_obj, variants, spacing=settings.grid_spacing or None,
+                        columns=settings.grid_columns)
+        self.report({'INFO'}, f"Laid out {len(variants)} variants of {base_obj.name}")
+        return {'FINISHED'}
+
+
 class LV_OT_GenerateVariant(Operator):
     """Generate variant and apply color remaps"""
     bl_idname = "livevariant.generate_variant"
@@ -102,24 +373,249 @@ class LV_OT_GenerateVariant(Operator):
             return {'CANCELLED'}
 
         # Try to find its duplicate
-        variant_obj = None
-        for obj in bpy.context.scene.objects:
-            if obj.name.startswith(f"{base_obj.name}_Variant"):
-                variant_obj = obj
-                break
-
+        variant_obj = _find_variant(context.scene, base_obj)
         if not variant_obj:
             self.report({'ERROR'}, "Variant not found. Click 'Create Textured Pair' first.")
             return {'CANCELLED'}
 
         # Collect user-defined remaps
+        settings = context.scene.live_variant_settings
         remaps = []
-        for entry in context.scene.live_variant_settings.remap_list:
+        for entry in settings.remap_list:
             remaps.append((tuple(entry.source_color), tuple(entry.target_color)))
 
         # Apply multi-remap
-        apply_multi_remap(base_obj, variant_obj, remaps)
-        self.report({'INFO'}, f"Remaps applied to {variant_obj.name}")
+        _sync_bake_settings(context)
+        apply_multi_remap(
+            base_obj, variant_obj, remaps,
+            tolerance=settings.tolerance,
+            engine=settings.engine,
+            lut_size=settings.lut_size,
+        )
+        self.report({'INFO'}, f"Remaps applied to {variant_obj.name}{_bake_report(settings.engine)}")
+        return {'FINISHED'}
+
+
+class LV_OT_GenerateVariantBackground(Operator):
+    """Bake the color remaps on a worker thread while you keep working (ESC cancels)"""
+    bl_idname = "livevariant.generate_variant_background"
+    bl_label = "Bake in Background"
+
+    _job = None
+    _timer = None
+    _variant_name = ""
+    _base_name = ""
+    _materials = ()
+    _registration = None
+
+    def invoke(self, context, event):
+        from color_remap import start_background_bake
+        from texture_setup import variant_materials
+
+        base_obj = context.active_object
+        if not base_obj:
+            self.report({'ERROR'}, "Select the base mesh first.")
+            return {'CANCELLED'}
+
+        variant_obj = _find_variant(context.scene, base_obj)
+        if not variant_obj:
+            self.report({'ERROR'}, "Variant not found. Click 'Create Textured Pair' first.")
+            return {'CANCELLED'}
+
+        settings = context.scene.live_variant_settings
+        if settings.engine not in BAKE_ENGINES:
+            self.report({'ERROR'}, "Pick a Bake engine to bake in the background.")
+            return {'CANCELLED'}
+        remaps = [(tuple(e.source_color), tuple(e.target_color)) for e in settings.remap_list]
+
+        # Remember the variant's materials so ESC can put them back, and how
+        # it is being made, so it can be registered once the bake succeeds
+        self._variant_name = variant_obj.name
+        self._base_name = base_obj.name
+        self._materials = variant_materials(variant_obj)
+        self._registration = (remaps, settings.tolerance, settings.engine, settings.lut_size)
+
+        _sync_bake_settings(context)
+        self._job = start_background_bake(
+            base_obj, variant_obj, remaps,
+            tolerance=settings.tolerance,
+            engine=settings.engine,
+            lut_size=settings.lut_size,
+        )
+        if not self._job:
+            self.report({'ERROR'}, "Failed to start bake — see console.")
+            return {'CANCELLED'}
+
+        wm = context.window_manager
+        wm.progress_begin(0, 100)
+        self._timer = wm.event_timer_add(0.1, window=context.window)
+        wm.modal_handler_add(self)
+        return {'RUNNING_MODAL'}
+
+    def modal(self, context, event):
+        from color_remap import finish_background_bake
+        from multi_remap_controller import register_variant
+
+        if event.type == 'ESC' and event.value == 'PRESS':
+            self.cancel(context)
+            self.report({'INFO'}, "Background bake cancelled.")
+            return {'CANCELLED'}
+        if event.type != 'TIMER':
+            return {'PASS_THROUGH'}
+
+        done = self._job.poll()
+        context.window_manager.progress_update(self._job.progress * 100)
+        for area in context.screen.areas:
+            if area.type in {'VIEW_3D', 'IMAGE_EDITOR'}:
+                area.tag_redraw()
+        if not done:
+            return {'PASS_THROUGH'}
+
+        self._stop_timer(context)
+        variant_obj = bpy.data.objects.get(self._variant_name)
+        if not finish_background_bake(self._job, variant_obj, self._materials):
+            self.report({'ERROR'}, "Background bake failed — see console.")
+            return {'CANCELLED'}
+
+        base_obj = bpy.data.objects.get(self._base_name)
+        if base_obj:
+            register_variant(base_obj, variant_obj, *self._registration)
+        engine = self._registration[2]
+        self.report({'INFO'}, f"Remaps baked into {self._variant_name}{_bake_report(engine)}")
+        return {'FINISHED'}
+
+    def cancel(self, context):
+        """Stop the worker and restore the variant's previous materials."""
+        from color_remap import cancel_background_bake
+
+        self._stop_timer(context)
+        cancel_background_bake(self._job, bpy.data.objects.get(self._variant_name), self._materials)
+
+    def _stop_timer(self, context):
+        wm = context.window_manager
+        wm.event_timer_remove(self._timer)
+        wm.progress_end()
+
+
+class LV_OT_RegenerateVariants(Operator):
+    """Re-apply the stored remaps of the base's out-of-date variants (e.g. after repainting it)"""
+    bl_idname = "livevariant.regenerate_variants"
+    bl_label = "Regenerate Variants"
+
+    def execute(self, context):
+        from multi_remap_controller import regenerate_registered_variants
+        from variant_registry import variants_of
+
+        base_obj = context.active_object
+        if not base_obj:
+            self.report({'ERROR'}, "Select the base mesh first.")
+            return {'CANCELLED'}
+
+        _sync_bake_settings(context)
+        regenerated, failed = regenerate_registered_variants(variants_of(base_obj), only_dirty=True)
+        if failed:
+            self.report({'WARNING'}, f"{len(failed)} variants failed to regenerate — see console.")
+        else:
+            self.report({'INFO'}, f"Regenerated {len(regenerated)} variants")
+        return {'FINISHED'}
+
+
+class LV_OT_BuildLineup(Operator):
+    """Show every registered variant of the base as an instance in one Geometry Nodes lineup"""
+    bl_idname = "livevariant.build_lineup"
+    bl_label = "Build Lineup"
+
+    def execute(self, context):
+        from variant_lineup import build_lineup
+        from variant_registry import variants_of, stored_settings
+
+        base_obj = context.active_object
+        if not base_obj:
+            self.report({'ERROR'}, "Select the base mesh first.")
+            return {'CANCELLED'}
+
+        colorways = [stored_settings(variant) for variant in variants_of(base_obj)
+                     if variant.live_variant.applied]
+        if not colorways:
+            self.report({'ERROR'}, "No variants applied to this base yet.")
+            return {'CANCELLED'}
+
+        lineup_obj = build_lineup(
+            base_obj,
+            [settings["remap_list"] for settings in colorways],
+            tolerance=[settings["tolerance"] for settings in colorways],
+            spacing=context.scene.live_variant_settings.grid_spacing or None,
+            collection=context.collection,
+        )
+        if not lineup_obj:
+            self.report({'ERROR'}, "Failed to build lineup — see console.")
+            return {'CANCELLED'}
+        self.report({'INFO'}, f"{len(colorways)} colorways lined up in {lineup_obj.name}")
+        return {'FINISHED'}
+
+
+class LV_OT_ExportCube(Operator, ExportHelper):
+    """Compile the color remaps into a 3D LUT and save it as a .cube file"""
+    bl_idname = "livevariant.export_cube"
+    bl_label = "Export .cube"
+
+    filename_ext = ".cube"
+    filter_glob: StringProperty(default="*.cube", options={'HIDDEN'})
+
+    def execute(self, context):
+        from remap_lut import build_lut, write_cube
+
+        settings = context.scene.live_variant_settings
+        remaps = [(tuple(e.source_color), tuple(e.target_color)) for e in settings.remap_list]
+        if not remaps:
+            self.report({'ERROR'}, "Add at least one color remap first.")
+            return {'CANCELLED'}
+
+        lut = build_lut(remaps, settings.tolerance, settings.lut_size)
+        write_cube(self.filepath, lut, title=context.scene.name)
+        self.report({'INFO'}, f"LUT saved to {self.filepath}")
+        return {'FINISHED'}
+
+
+class LV_OT_ImportCube(Operator, ImportHelper):
+    """Bake the variant through a LUT loaded from a .cube file"""
+    bl_idname = "livevariant.import_cube"
+    bl_label = "Import .cube"
+
+    filename_ext = ".cube"
+    filter_glob: StringProperty(default="*.cube", options={'HIDDEN'})
+
+    def execute(self, context):
+        from color_remap import apply_color_remaps
+        from remap_lut import read_cube
+        from variant_registry import link_variant, forget_remaps
+
+        base_obj = context.active_object
+        if not base_obj:
+            self.report({'ERROR'}, "Select the base mesh first.")
+            return {'CANCELLED'}
+
+        variant_obj = _find_variant(context.scene, base_obj)
+        if not variant_obj:
+            self.report({'ERROR'}, "Variant not found. Click 'Create Textured Pair' first.")
+            return {'CANCELLED'}
+
+        try:
+            lut = read_cube(self.filepath)
+        except (OSError, ValueError) as e:
+            self.report({'ERROR'}, f"Could not read LUT: {e}")
+            return {'CANCELLED'}
+
+        _sync_bake_settings(context)
+        if not apply_color_remaps(base_obj, variant_obj, [], engine='LUT', lut=lut):
+            self.report({'ERROR'}, "Failed to bake LUT — see console.")
+            return {'CANCELLED'}
+
+        # The registry only stores remap pairs, which cannot reproduce an
+        # external LUT; keep regeneration from overwriting the import
+        link_variant(base_obj, variant_obj)
+        forget_remaps(variant_obj)
+        self.report({'INFO'}, f"LUT applied to {variant_obj.name}{_bake_report('LUT')}")
         return {'FINISHED'}
 
 
@@ -140,6 +636,13 @@ class LV_PT_LiveVariantPanel(Panel):
 
         col = layout.column(align=True)
         col.operator("livevariant.create_pair", icon="MESH_DATA")
+        col.prop(settings, "share_mesh")
+        col.prop(settings, "grid_layout")
+        if settings.grid_layout:
+            row = col.row(align=True)
+            row.prop(settings, "grid_spacing")
+            row.prop(settings, "grid_columns")
+            col.operator("livevariant.layout_variants", icon='MESH_GRID')
         layout.separator()
 
         layout.label(text="Color Remap Pairs:")
@@ -154,11 +657,118 @@ class LV_PT_LiveVariantPanel(Panel):
         row.operator("livevariant.remove_remap", text="– Remove")
 
         layout.separator()
+        layout.prop(settings, "engine")
+        layout.prop(settings, "tolerance")
+        if settings.engine in {'NODES', 'PALETTE', 'SHARED'}:
+            layout.prop(settings, "live_preview")
+        if settings.engine == 'LUT':
+            layout.prop(settings, "lut_size")
+            row = layout.row(align=True)
+            row.operator("livevariant.export_cube", icon='EXPORT')
+            row.operator("livevariant.import_cube", icon='IMPORT')
         layout.operator("livevariant.generate_variant", icon='NODETREE')
+        if settings.engine in BAKE_ENGINES:
+            layout.operator("livevariant.generate_variant_background", icon='TIME')
+        layout.operator("livevariant.build_lineup", icon='GEOMETRY_NODES')
+
+        base_obj = context.active_object
+        if base_obj:
+            from variant_registry import variants_of
+
+            if base_obj.live_variant.variants:
+                layout.prop_search(base_obj.live_variant, "active_variant",
+                                   bpy.data, "objects", text="Variant")
+            stale = sum(v.live_variant.dirty for v in variants_of(base_obj))
+            if stale:
+                layout.label(text=f"{stale} variants out of date", icon='ERROR')
+                layout.operator("livevariant.regenerate_variants", icon='FILE_REFRESH')
 
 
 # --------------------------------------------------------
-# 5️⃣ Registration
+# 5️⃣ Add-on Preferences
+# --------------------------------------------------------
+class LV_AddonPreferences(AddonPreferences):
+    bl_idname = __package__
+
+    tile_rows: IntProperty(
+        name="Tile Rows",
+        description="Image rows remapped per band when baking",
+        min=1,
+        max=16384,
+        default=256
+    )
+
+    memory_budget_mb: IntProperty(
+        name="Memory Budget (MiB)",
+        description="Cap on temporary memory per band while baking; bands shrink to fit",
+        min=16,
+        max=65536,
+        default=256
+    )
+
+    bake_threads: IntProperty(
+        name="Threads",
+        description="Worker threads for baking bands (0 = one per CPU core)",
+        min=0,
+        max=256,
+        default=0
+    )
+
+    pixel_cache_mb: IntProperty(
+        name="Pixel Cache (MiB)",
+        description="Memory for keeping base texture pixels between applies (0 = off)",
+        min=0,
+        max=65536,
+        default=512
+    )
+
+    texture_resolution: EnumProperty(
+        name="Texture Resolution",
+        description="Size of the base texture created for objects without one",
+        items=[(str(2**i), str(2**i), f"{2**i} × {2**i} pixels") for i in range(9, 14)],
+        default='1024'
+    )
+
+    lazy_texture: BoolProperty(
+        name="Allocate on Paint",
+        description="Create the base texture only once Texture Paint mode is entered (or a remap needs it)",
+        default=False
+    )
+
+    bake_cache_dir: StringProperty(
+        name="Bake Cache Folder",
+        description="Where baked variant textures are cached between sessions (empty = Blender user data folder)",
+        subtype='DIR_PATH',
+        default=""
+    )
+
+    bake_cache_mb: IntProperty(
+        name="Bake Cache Size (MiB)",
+        description="Size cap of the bake cache; least recently used bakes are deleted first (0 = off)",
+        min=0,
+        max=1048576,
+        default=2048
+    )
+
+    def draw(self, context):
+        layout = self.layout
+        layout.label(text="Base Texture:")
+        row = layout.row()
+        row.prop(self, "texture_resolution")
+        row.prop(self, "lazy_texture")
+        layout.label(text="Baking:")
+        row = layout.row()
+        row.prop(self, "tile_rows")
+        row.prop(self, "memory_budget_mb")
+        row.prop(self, "bake_threads")
+        layout.prop(self, "pixel_cache_mb")
+        row = layout.row()
+        row.prop(self, "bake_cache_dir")
+        row.prop(self, "bake_cache_mb")
+
+
+# --------------------------------------------------------
+# 6️⃣ Registration
 # --------------------------------------------------------
 classes = (
     LiveVariantColorMap,
@@ -166,20 +776,46 @@ classes = (
     LV_OT_AddRemap,
     LV_OT_RemoveRemap,
     LV_OT_CreateBaseAndVariant,
+    LV_OT_LayoutVariants,
     LV_OT_GenerateVariant,
+    LV_OT_GenerateVariantBackground,
+    LV_OT_RegenerateVariants,
+    LV_OT_BuildLineup,
+    LV_OT_ExportCube,
+    LV_OT_ImportCube,
     LV_PT_LiveVariantPanel,
 )
 
+# Preferences belong to an installed add-on; a loose script has no package
+if __package__:
+    classes += (LV_AddonPreferences,)
+
 def register():
+    import variant_registry
+
+    variant_registry.register()
     for cls in classes:
         bpy.utils.register_class(cls)
     bpy.types.Scene.live_variant_settings = PointerProperty(type=LiveVariantSettings)
+    bpy.app.handlers.load_pre.append(_clear_caches_on_load)
+    bpy.app.handlers.load_post.append(_resubscribe_on_load)
+    _subscribe_mode_changes()
 
 
 def unregister():
+    import variant_registry
+
+    bpy.msgbus.clear_by_owner(_mode_owner)
+    if _resubscribe_on_load in bpy.app.handlers.load_post:
+        bpy.app.handlers.load_post.remove(_resubscribe_on_load)
+    if _clear_caches_on_load in bpy.app.handlers.load_pre:
+        bpy.app.handlers.load_pre.remove(_clear_caches_on_load)
+    if bpy.app.timers.is_registered(_flush_live_preview):
+        bpy.app.timers.unregister(_flush_live_preview)
     for cls in reversed(classes):
         bpy.utils.unregister_class(cls)
     del bpy.types.Scene.live_variant_settings
+    variant_registry.unregister()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,159 @@
+"""
+variant_layout.py
+
+Layout engine for many variants per base: keeps every variant of a base in
+its own "<base>_Variants" collection and arranges them in a grid next to the
+base, which itself never moves.
+
+Positions are computed for the whole grid at once and each object is moved
+exactly once, instead of shuffling objects pair by pair.
+
+Usage example:
+
+    import variant_layout as vly
+    base = bpy.data.objects["Cube"]
+    vly.layout_variants(base, spacing=3.0, columns=5)
+"""
+
+import math
+
+import bpy
+from mathutils import Vector
+
+
+# Variants per grid row unless a caller sets `columns`
+DEFAULT_COLUMNS = 8
+
+
+# -----------------------------------------------------
+# GRID
+# -----------------------------------------------------
+
+def grid_positions(count, spacing, columns=None):
+    """
+    Return `count` (x, y, z) positions on a grid, row by row along +X and
+    rows stepping along -Y.
+
+    Args:
+        count (int): Number of positions.
+        spacing (float): Distance between neighbouring positions.
+        columns (int): Positions per row (default: a square-ish grid).
+    """
+    columns = columns or max(1, math.ceil(math.sqrt(count)))
+    return [((i % columns) * spacing, -(i // columns) * spacing, 0.0) for i in range(count)]
+
+
+def default_spacing(base_obj):
+    """Grid spacing that keeps copies of `base_obj` from touching."""
+    return max(base_obj.dimensions) * 1.5 or 2.0
+
+
+def grid_origin(base_obj, spacing):
+    """World position of the first grid slot: one step to the base's +X."""
+    return base_obj.location + Vector((spacing, 0.0, 0.0))
+
+
+def lineup_origin(base_obj, spacing):
+    """
+    World position of the first slot of the base's colorway lineup (see
+    variant_lineup.py): one step to the base's +X and +Y. The lineup's rows
+    grow along +Y, away from the variant grid, so the two never overlap.
+    """
+    return base_obj.location + Vector((spacing, spacing, 0.0))
+
+
+# -----------------------------------------------------
+# COLLECTIONS
+# -----------------------------------------------------
+
+def variant_collection(base_obj):
+    """
+    Return the "<base>_Variants" collection, creating it as a child of the
+    base object's first collection (or the scene collection) if missing.
+    """
+    name = f"{base_obj.name}_Variants"
+    collection = bpy.data.collections.get(name)
+    if collection is None:
+        collection = bpy.data.collections.new(name)
+        parent = (base_obj.users_collection[0] if base_obj.users_collection
+                  else bpy.context.scene.collection)
+        parent.children.link(collection)
+    return collection
+
+
+def collect_variants(base_obj, variants):
+    """Move `variants` into the base's variant collection (out of any other)."""
+    collection = variant_collection(base_obj)
+    for obj in variants:
+        for other in list(obj.users_collection):
+            if other != collection:
+                other.objects.unlink(obj)
+        if collection not in obj.users_collection:
+            collection.objects.link(obj)
+    return collection
+
+
+# -----------------------------------------------------
+# PLACEMENT
+# -----------------------------------------------------
+
+def layout_variants(base_obj, variants=None, spacing=None, columns=DEFAULT_COLUMNS):
+    """
+    Place `variants` in a grid beside `base_obj`, in one pass.
+
+    Args:
+        base_obj (Object): The base object; it is not moved.
+        variants (list[Object]): Objects to place, in grid order (default:
+            the objects of the base's variant collection).
+        spacing (float): Distance between grid slots (default: see
+            default_spacing).
+        columns (int): Variants per row (None = square-ish grid).
+
+    Returns:
+        list[Object]: The placed variants.
+    """
+    if variants is None:
+        variants = list(variant_collection(base_obj).objects)
+    spacing = spacing or default_spacing(base_obj)
+
+    origin = grid_origin(base_obj, spacing)
+    for obj, position in zip(variants, grid_positions(len(variants), spacing, columns)):
+        obj.location = origin + Vector(position)
+    return variants
+
+
+def place_variant(base_obj, variant_obj, spacing=None, columns=DEFAULT_COLUMNS):
+    """
+    Put `variant_obj` into the base's variant collection and move it to the
+    first grid slot no other object of that collection occupies, leaving
+    the other variants alone (for adding variants one at a time, e.g. in
+    batch runs). Slots freed by deleted variants are filled again.
+
+    Returns:
+        Vector: The variant's new location.
+    """
+    collection = collect_variants(base_obj, [variant_obj])
+    spacing = spacing or default_spacing(base_obj)
+    columns = columns or DEFAULT_COLUMNS  # a square grid would shift as variants are added
+    origin = grid_origin(base_obj, spacing)
+
+    occupied = _occupied_slots(
+        [obj for obj in collection.objects if obj != variant_obj], origin, spacing, columns)
+    index = 0
+    while index in occupied:
+        index += 1
+
+    position = grid_positions(index + 1, spacing, columns)[index]
+    variant_obj.location = origin + Vector(position)
+    return variant_obj.location
+
+
+def _occupied_slots(objects, origin, spacing, columns):
+    """Indices of the grid slots nearest to each of `objects` inside the grid."""
+    slots = set()
+    for obj in objects:
+        offset = (obj.location - origin) / spacing
+        column, row = round(offset.x), round(-offset.y)
+        if 0 <= column < columns and row >= 0:
+            slots.add(row * columns + column)
+    return slots
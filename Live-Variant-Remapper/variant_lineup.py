@@ -0,0 +1,206 @@
+"""
+variant_lineup.py
+
+Geometry Nodes lineup of colorways for turntables and overview renders.
+Instead of duplicating real objects, one "<base>_Lineup" object holds a
+point per colorway; a Geometry Nodes modifier instances the base mesh on
+every point, and a single shared material (see
+color_remap.get_instancer_remap_material) remaps each instance's colors
+from the per-point attributes lv_source_<i> / lv_target_<i> /
+lv_strength_<i> / lv_remap_tolerance. Memory stays close to one object no
+matter how many colorways are shown.
+
+Usage example:
+
+    import variant_lineup as vl
+    vl.build_lineup(
+        bpy.data.objects["Cube"],
+        remap_lists=[
+            [((1.0, 0.8, 0.0, 1.0), (0.0, 0.2, 1.0, 1.0))],  # Yellow → Blue
+            [((1.0, 0.8, 0.0, 1.0), (0.1, 0.9, 0.3, 1.0))],  # Yellow → Green
+        ],
+        tolerance=0.1,
+    )
+"""
+
+import bpy
+import numpy as np
+
+from color_remap import (
+    get_instancer_remap_material,
+    SHARED_SOURCE, SHARED_TARGET, SHARED_STRENGTH, SHARED_TOLERANCE,
+)
+from variant_layout import grid_positions, lineup_origin, default_spacing
+
+
+LINEUP_MODIFIER = "LV Lineup"
+
+
+# -----------------------------------------------------
+# LINEUP BUILDER
+# -----------------------------------------------------
+
+def build_lineup(base_obj, remap_lists, tolerance=0.1, columns=None, spacing=None,
+                 collection=None):
+    """
+    Build or refresh the Geometry Nodes lineup of `base_obj`.
+
+    Args:
+        base_obj (Object): Textured base mesh object.
+        remap_lists (list[list]): One list of ((R,G,B,A), (R,G,B,A)) pairs
+            per colorway.
+        tolerance (float | list[float]): Color distance threshold, either
+            for all colorways or one per colorway.
+        columns (int): Colorways per row (default: a square-ish grid).
+        spacing (float): Distance between colorways (default: 1.5× the
+            base's largest dimension).
+        collection (Collection): Where to link a new lineup object
+            (default: the base object's first collection).
+
+    Returns:
+        Object: The "<base>_Lineup" object, or None on failure.
+    """
+    if not base_obj or base_obj.type != 'MESH':
+        print("❌ Please select a valid mesh object.")
+        return None
+    if not remap_lists:
+        print("⚠️ No colorways to line up.")
+        return None
+
+    tolerances = list(tolerance) if isinstance(tolerance, (list, tuple)) \
+        else [tolerance] * len(remap_lists)
+    if len(tolerances) != len(remap_lists):
+        print("❌ Need exactly one tolerance per colorway.")
+        return None
+
+    stage_count = max(len(remaps) for remaps in remap_lists)
+    remap_mat = get_instancer_remap_material(base_obj, stage_count)
+    if remap_mat is None:
+        return None
+
+    if spacing is None:
+        spacing = default_spacing(base_obj)
+
+    name = f"{base_obj.name}_Lineup"
+
+    # --- Points: one per colorway, carrying its colors as attributes ---
+    mesh = bpy.data.meshes.get(name) or bpy.data.meshes.new(name)
+    mesh.clear_geometry()
+    # Rows grow along +Y, away from the base's variant grid (see lineup_origin)
+    points = [(x, -y, z) for x, y, z in grid_positions(len(remap_lists), spacing, columns)]
+    mesh.from_pydata(points, [], [])
+    _write_point_attributes(mesh, remap_lists, tolerances, stage_count)
+    mesh.update()
+
+    # --- Object with the instancing modifier ---
+    lineup_obj = bpy.data.objects.get(name)
+    if lineup_obj is None or lineup_obj.type != 'MESH':
+        lineup_obj = bpy.data.objects.new(name, mesh)
+        if collection is None:
+            collection = (base_obj.users_collection[0] if base_obj.users_collection
+                          else bpy.context.scene.collection)
+        collection.objects.link(lineup_obj)
+        lineup_obj.location = lineup_origin(base_obj, spacing)
+    elif lineup_obj.data != mesh:
+        lineup_obj.data = mesh
+    lineup_obj["lv_lineup_base"] = base_obj.name
+
+    mod = lineup_obj.modifiers.get(LINEUP_MODIFIER)
+    if mod is None:
+        mod = lineup_obj.modifiers.new(LINEUP_MODIFIER, 'NODES')
+    mod.node_group = _build_lineup_node_group(name, base_obj, remap_mat)
+
+    print(f"🧩 Lined up {len(remap_lists)} colorways of '{base_obj.name}' in '{lineup_obj.name}'")
+    return lineup_obj
+
+
+def _write_point_attributes(mesh, remap_lists, tolerances, stage_count):
+    """Store each colorway's pairs as point attributes (missing pairs get strength 0)."""
+    count = len(remap_lists)
+    for i in range(stage_count):
+        sources = np.zeros((count, 4), dtype=np.float32)
+        targets = np.zeros((count, 4), dtype=np.float32)
+        strengths = np.zeros(count, dtype=np.float32)
+        for point, remaps in enumerate(remap_lists):
+            if i < len(remaps):
+                sources[point], targets[point] = remaps[i]
+                strengths[point] = 1.0
+        _set_point_attribute(mesh, SHARED_SOURCE.format(i), 'FLOAT_COLOR', sources)
+        _set_point_attribute(mesh, SHARED_TARGET.format(i), 'FLOAT_COLOR', targets)
+        _set_point_attribute(mesh, SHARED_STRENGTH.format(i), 'FLOAT', strengths)
+    _set_point_attribute(mesh, SHARED_TOLERANCE, 'FLOAT', np.asarray(tolerances, np.float32))
+
+    # Drop stages left over from a longer remap list (they read as strength 0)
+    i = stage_count
+    while mesh.attributes.get(SHARED_STRENGTH.format(i)) is not None:
+        for key in (SHARED_SOURCE, SHARED_TARGET, SHARED_STRENGTH):
+            attr = mesh.attributes.get(key.format(i))
+            if attr is not None:
+                mesh.attributes.remove(attr)
+        i += 1
+
+
+def _set_point_attribute(mesh, name, data_type, values):
+    attr = mesh.attributes.get(name)
+    if attr is not None and (attr.data_type != data_type or attr.domain != 'POINT'):
+        mesh.attributes.remove(attr)
+        attr = None
+    if attr is None:
+        attr = mesh.attributes.new(name, data_type, 'POINT')
+    attr.data.foreach_set("color" if data_type == 'FLOAT_COLOR' else "value", values.ravel())
+
+
+def _build_lineup_node_group(name, base_obj, remap_mat):
+    """
+    (Re)build the lineup's Geometry Nodes group:
+    Object Info (base) → Set Material → Instance on Points (lineup points).
+    Point attributes carry over to the instances, where the material reads
+    them through INSTANCER Attribute nodes.
+    """
+    group = bpy.data.node_groups.get(name)
+    if group is None or group.bl_idname != "GeometryNodeTree":
+        group = bpy.data.node_groups.new(name, "GeometryNodeTree")
+    group.nodes.clear()
+
+    iface = group.interface
+    if not any(item.item_type == 'SOCKET' and item.in_out == 'INPUT'
+               for item in iface.items_tree):
+        iface.new_socket("Geometry", in_out='INPUT', socket_type='NodeSocketGeometry')
+    if not any(item.item_type == 'SOCKET' and item.in_out == 'OUTPUT'
+               for item in iface.items_tree):
+        iface.new_socket("Geometry", in_out='OUTPUT', socket_type='NodeSocketGeometry')
+
+    nodes = group.nodes
+    links = group.links
+
+    g_in = nodes.new("NodeGroupInput")
+    info = nodes.new("GeometryNodeObjectInfo")
+    set_mat = nodes.new("GeometryNodeSetMaterial")
+    instance = nodes.new("GeometryNodeInstanceOnPoints")
+    g_out = nodes.new("NodeGroupOutput")
+
+    g_in.location = (-400, 100)
+    info.location = (-600, -150)
+    set_mat.location = (-350, -150)
+    instance.location = (-50, 0)
+    g_out.location = (200, 0)
+
+    info.transform_space = 'ORIGINAL'
+    info.inputs["Object"].default_value = base_obj
+    set_mat.inputs["Material"].default_value = remap_mat
+
+    links.new(info.outputs["Geometry"], set_mat.inputs["Geometry"])
+    links.new(g_in.outputs[0], instance.inputs["Points"])
+    links.new(set_mat.outputs["Geometry"], instance.inputs["Instance"])
+    links.new(instance.outputs["Instances"], g_out.inputs[0])
+    return group
+
+
+# Optional test
+if __name__ == "__main__":
+    obj = bpy.context.active_object
+    build_lineup(obj, [
+        [((1.0, 0.8, 0.0, 1.0), (0.0, 0.2, 1.0, 1.0))],
+        [((1.0, 0.8, 0.0, 1.0), (0.1, 0.9, 0.3, 1.0))],
+        [((1.0, 0.8, 0.0, 1.0), (0.9, 0.1, 0.1, 1.0))],
+    ])
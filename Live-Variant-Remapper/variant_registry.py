@@ -0,0 +1,234 @@
+"""
+variant_registry.py
+
+Persistent base → variant registry, stored on the objects themselves
+(`Object.live_variant`) so it is saved with the .blend file:
+
+- A variant points at its base and stores the remap list, tolerance, engine
+  and LUT size it was made with, plus a dirty flag set when its result is
+  out of date (e.g. the base texture was repainted after a bake).
+- A base keeps pointers to its variants, so finding them never scans the
+  scene, and renaming either object does not break the link.
+
+The add-on registers the property groups in ui.py; headless scripts
+(batch_runner.py, library_sweep.py) run without the add-on enabled, so every
+entry point here registers them on first use.
+
+Usage example:
+
+    import variant_registry as vr
+    vr.link_variant(base, variant)
+    vr.store_remaps(variant, remaps, tolerance=0.08, engine='BAKE')
+    for variant in vr.variants_of(base):
+        print(variant.name, vr.stored_settings(variant))
+"""
+
+import bpy
+from bpy.props import (
+    BoolProperty, CollectionProperty, FloatProperty, FloatVectorProperty,
+    IntProperty, PointerProperty, StringProperty,
+)
+from bpy.types import PropertyGroup
+
+
+# Engines whose materials read the base texture live, so repainting the
+# base never leaves their variants out of date
+LIVE_ENGINES = {'NODES', 'SHARED'}
+
+
+# -----------------------------------------------------
+# PROPERTY GROUPS
+# -----------------------------------------------------
+
+class LiveVariantStoredRemap(PropertyGroup):
+    source_color: FloatVectorProperty(name="Source", subtype='COLOR', size=4, min=0.0, max=1.0)
+    target_color: FloatVectorProperty(name="Target", subtype='COLOR', size=4, min=0.0, max=1.0)
+
+
+class LiveVariantLink(PropertyGroup):
+    object: PointerProperty(name="Variant", type=bpy.types.Object)
+
+
+class LiveVariantInfo(PropertyGroup):
+    # Base side
+    variants: CollectionProperty(type=LiveVariantLink)
+    active_variant: PointerProperty(
+        name="Active Variant",
+        description="Variant the panel's remaps are applied to",
+        type=bpy.types.Object,
+        poll=lambda self, obj: obj.live_variant.base == self.id_data,
+    )
+
+    # Variant side
+    base: PointerProperty(name="Base", type=bpy.types.Object)
+    remaps: CollectionProperty(type=LiveVariantStoredRemap)
+    applied: BoolProperty(name="Applied", description="Remaps have been applied and stored")
+    tolerance: FloatProperty(name="Tolerance", default=0.08)
+    engine: StringProperty(name="Engine", default='NODES')
+    lut_size: IntProperty(name="LUT Size", default=33)
+    dirty: BoolProperty(
+        name="Out of Date",
+        description="The stored remaps need to be applied again",
+    )
+
+
+classes = (
+    LiveVariantStoredRemap,
+    LiveVariantLink,
+    LiveVariantInfo,
+)
+
+
+def register():
+    """Register the registry's property groups and `Object.live_variant` (idempotent)."""
+    if hasattr(bpy.types.Object, "live_variant"):
+        return
+    for cls in classes:
+        bpy.utils.register_class(cls)
+    bpy.types.Object.live_variant = PointerProperty(type=LiveVariantInfo)
+
+
+def unregister():
+    if not hasattr(bpy.types.Object, "live_variant"):
+        return
+    del bpy.types.Object.live_variant
+    for cls in reversed(classes):
+        bpy.utils.unregister_class(cls)
+
+
+# -----------------------------------------------------
+# LINKS
+# -----------------------------------------------------
+
+def link_variant(base_obj, variant_obj):
+    """
+    Record `variant_obj` as a variant of `base_obj` and make it the base's
+    active variant, unlinking it from any previous base.
+    """
+    register()
+    info = variant_obj.live_variant
+    previous = info.base
+    if previous is not None and previous != base_obj:
+        _unlink(previous, variant_obj)
+
+    # Object.copy() carries the base's own variant list over to a duplicate
+    info.variants.clear()
+    info.active_variant = None
+    info.base = base_obj
+
+    links = base_obj.live_variant.variants
+    for i in reversed(range(len(links))):
+        obj = links[i].object
+        if obj is None or obj == variant_obj or obj.live_variant.base != base_obj:
+            links.remove(i)  # stale link (deleted / relinked object) or re-link
+    links.add().object = variant_obj
+    base_obj.live_variant.active_variant = variant_obj
+
+
+def _unlink(base_obj, variant_obj):
+    links = base_obj.live_variant.variants
+    for i in reversed(range(len(links))):
+        if links[i].object == variant_obj:
+            links.remove(i)
+    if base_obj.live_variant.active_variant == variant_obj:
+        base_obj.live_variant.active_variant = None
+
+
+def variants_of(base_obj):
+    """
+    Return the variants of `base_obj`, oldest first, skipping links to
+    deleted objects and to objects since linked to another base (pruned by
+    the next link_variant; this function never writes, so panels can call it).
+    """
+    register()
+    return [link.object for link in base_obj.live_variant.variants
+            if link.object is not None and link.object.live_variant.base == base_obj]
+
+
+def active_variant(base_obj):
+    """Return the base's active variant (default: its newest one), or None."""
+    register()
+    obj = base_obj.live_variant.active_variant
+    if obj is not None and obj.live_variant.base == base_obj:
+        return obj
+    variants = variants_of(base_obj)
+    return variants[-1] if variants else None
+
+
+# -----------------------------------------------------
+# STORED REMAPS
+# -----------------------------------------------------
+
+def store_remaps(variant_obj, remap_list, tolerance, engine, lut_size=33):
+    """Store how `variant_obj` was made and mark it up to date."""
+    register()
+    info = variant_obj.live_variant
+    info.remaps.clear()
+    for source_color, target_color in remap_list:
+        entry = info.remaps.add()
+        entry.source_color = source_color
+        entry.target_color = target_color
+    info.tolerance = tolerance
+    info.engine = engine
+    info.lut_size = lut_size
+    info.applied = True
+    info.dirty = False
+
+
+def forget_remaps(variant_obj):
+    """
+    Drop the stored remaps of `variant_obj`, e.g. after it was baked from
+    an imported .cube LUT they cannot reproduce. The variant stays linked
+    to its base, but regeneration skips it from then on.
+    """
+    register()
+    info = variant_obj.live_variant
+    info.remaps.clear()
+    info.applied = False
+    info.dirty = False
+
+
+def stored_settings(variant_obj):
+    """
+    Return the stored remap_list, tolerance, engine and lut_size of
+    `variant_obj` (the keyword arguments of apply_multi_remap).
+    """
+    info = variant_obj.live_variant
+    return {
+        "remap_list": [(tuple(e.source_color), tuple(e.target_color)) for e in info.remaps],
+        "tolerance": info.tolerance,
+        "engine": info.engine,
+        "lut_size": info.lut_size,
+    }
+
+
+def mark_dirty(base_obj):
+    """
+    Flag the baked variants of `base_obj` as out of date, e.g. after its
+    texture was repainted. Variants using a live engine are left alone.
+
+    Returns:
+        int: Number of variants newly flagged.
+    """
+    flagged = 0
+    for variant_obj in variants_of(base_obj):
+        info = variant_obj.live_variant
+        if info.applied and not info.dirty and info.engine not in LIVE_ENGINES:
+            info.dirty = True
+            flagged += 1
+    return flagged
+
+
+def registered_variants(objects=None, only_dirty=False):
+    """
+    Yield (variant_obj, base_obj, settings) for every variant with stored
+    remaps among `objects` (default: all objects). `settings` is
+    stored_settings(variant_obj).
+    """
+    register()
+    for obj in list(objects if objects is not None else bpy.data.objects):
+        info = obj.live_variant
+        if info.base is None or not info.applied or (only_dirty and not info.dirty):
+            continue
+        yield obj, info.base, stored_settings(obj)
+